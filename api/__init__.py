@@ -24,8 +24,9 @@ def get_connection_string(
     database_password: str = database_password,
     database_hostname: str = database_hostname,
     database_name: str = database_name,
+    driver: str = "postgresql",
 ):
-    return f"postgresql://{database_username}:{database_password}@{database_hostname}/{database_name}"
+    return f"{driver}://{database_username}:{database_password}@{database_hostname}/{database_name}"
 
 
 root_directory = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -39,13 +40,18 @@ class DatabaseContext(str, Enum):
     SERVER = "server"
 
 
-database_context = DatabaseContext.LOCAL
+# the server database unless DATABASE_CONTEXT=local opts into the embedded SQLite one,
+# scripts switch it with --database_context
+default_database_context = DatabaseContext(
+    os.environ.get("DATABASE_CONTEXT", DatabaseContext.SERVER.value)
+)
+database_context = default_database_context
 user_token = None
 
 
 def set_global_database_context(db_context: DatabaseContext):
     if db_context is None:
-        db_context = DatabaseContext.LOCAL
+        db_context = default_database_context
     global database_context
     database_context = db_context
 
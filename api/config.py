@@ -0,0 +1,102 @@
+import os
+
+
+def get_env(name: str, default=None, type=str):
+    """Returns an environment variable converted to the given type."""
+
+    value = os.environ.get(name)
+
+    if value is None:
+        return default
+
+    if type == bool:
+        return value.lower() in ["1", "true", "yes"]
+
+    return type(value)
+
+
+class Settings:
+    def __init__(self) -> None:
+        # connection pool
+        self.database_pool_size = get_env("DATABASE_POOL_SIZE", 5, int)
+        self.database_max_overflow = get_env("DATABASE_MAX_OVERFLOW", 10, int)
+        self.database_pool_timeout = get_env("DATABASE_POOL_TIMEOUT", 30, float)
+        self.database_pool_recycle = get_env("DATABASE_POOL_RECYCLE", 1800, int)
+        self.database_pool_pre_ping = get_env("DATABASE_POOL_PRE_PING", True, bool)
+        self.database_pool_use_lifo = get_env("DATABASE_POOL_USE_LIFO", False, bool)
+
+        # read replicas
+        self.database_replica_urls = [
+            url for url in get_env("DATABASE_REPLICA_URLS", "").split(",") if url
+        ]
+        self.database_replica_strategy = get_env(
+            "DATABASE_REPLICA_STRATEGY", "round_robin"
+        )
+
+        # query instrumentation
+        self.query_repeat_threshold = get_env("QUERY_REPEAT_THRESHOLD", 5, int)
+
+        # pagination
+        self.count_cache_size = get_env("COUNT_CACHE_SIZE", 1024, int)
+        self.count_cache_ttl = get_env("COUNT_CACHE_TTL", 60, int)
+
+        # score ingestion
+        self.score_batch_size = get_env("SCORE_BATCH_SIZE", 500, int)
+        self.score_flush_interval = get_env("SCORE_FLUSH_INTERVAL", 0.05, float)
+        self.score_queue_size = get_env("SCORE_QUEUE_SIZE", 10000, int)
+        self.score_put_timeout = get_env("SCORE_PUT_TIMEOUT", 0.1, float)
+
+        # spaced repetition
+        self.review_cache_size = get_env("REVIEW_CACHE_SIZE", 10000, int)
+        self.review_cache_ttl = get_env("REVIEW_CACHE_TTL", 600, int)
+        self.review_queue_size = get_env("REVIEW_QUEUE_SIZE", 1000, int)
+        self.review_queue_horizon = get_env("REVIEW_QUEUE_HORIZON", 86400, int)
+
+        # word index
+        self.word_index_directory = get_env(
+            "WORD_INDEX_DIRECTORY",
+            os.path.join(os.path.dirname(os.path.dirname(__file__)), "word_index"),
+        )
+
+        # word sampling
+        self.sampler_cache_size = get_env("SAMPLER_CACHE_SIZE", 256, int)
+        self.sampler_exponent = get_env("SAMPLER_EXPONENT", 1.0, float)
+
+        # local database
+        self.local_database_path = get_env(
+            "LOCAL_DATABASE_PATH",
+            os.path.join(os.path.dirname(os.path.dirname(__file__)), "nulang.db"),
+        )
+        self.sqlite_mmap_size = get_env("SQLITE_MMAP_SIZE", 268435456, int)
+        self.sqlite_cache_size = get_env("SQLITE_CACHE_SIZE", -65536, int)
+        self.sqlite_synchronous = get_env("SQLITE_SYNCHRONOUS", "NORMAL")
+
+        # authentication
+        self.secret_key = get_env("SECRET_KEY", "nulang-secret-key")
+        self.algorithm = get_env("ALGORITHM", "HS256")
+        self.access_token_expire_minutes = get_env(
+            "ACCESS_TOKEN_EXPIRE_MINUTES", 30, int
+        )
+
+        # principal cache
+        self.principal_cache_size = get_env("PRINCIPAL_CACHE_SIZE", 10000, int)
+        self.principal_cache_ttl = get_env("PRINCIPAL_CACHE_TTL", 60, int)
+        self.role_version_ttl = get_env("ROLE_VERSION_TTL", 30, int)
+
+        # token revocation
+        self.revocation_backend = get_env("REVOCATION_BACKEND", "memory")
+        self.revocation_sqlite_path = get_env(
+            "REVOCATION_SQLITE_PATH", "revoked_tokens.db"
+        )
+        self.revocation_refresh_interval = get_env(
+            "REVOCATION_REFRESH_INTERVAL", 30, float
+        )
+        self.revocation_capacity = get_env("REVOCATION_CAPACITY", 100000, int)
+        self.revocation_error_rate = get_env("REVOCATION_ERROR_RATE", 0.001, float)
+
+        # password hashing
+        self.hashing_max_workers = get_env("HASHING_MAX_WORKERS", 2, int)
+        self.hashing_max_queue_depth = get_env("HASHING_MAX_QUEUE_DEPTH", 32, int)
+        self.hashing_target_seconds = get_env("HASHING_TARGET_SECONDS", 0.25, float)
+        self.bcrypt_min_rounds = get_env("BCRYPT_MIN_ROUNDS", 12, int)
+        self.bcrypt_max_rounds = get_env("BCRYPT_MAX_ROUNDS", 15, int)
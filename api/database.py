@@ -1,22 +1,138 @@
 from pprint import pprint
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 import os
 
-import uvicorn
+from fastapi import Request
 from api import *
+from api.config import Settings
 from utils.hash_utils import *
-from utils.file_utils import read_file
-from utils.parser import BoolArgument, Parser, Argument, PathArgument
+from utils.pool_utils import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    attach_pool_metrics,
+    get_pool_arguments,
+)
+from utils.sql_utils import iter_sql_statements, substitute_placeholders
+from utils.routing_utils import (
+    ReplicaRouter,
+    RoutingSession,
+    get_async_url,
+    use_primary,
+)
+from utils.str_utils import str_to_bool
+from utils.query_utils import instrument_engine
 
-import tempfile
-import stat
 import subprocess
+import time
+
+settings = Settings()
 
 # main database connection
 SQLALCHEMY_DATABASE_URL = get_connection_string()
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
+    **get_pool_arguments(settings),
+)
+
+# async database connection
+ASYNC_SQLALCHEMY_DATABASE_URL = get_connection_string(driver="postgresql+asyncpg")
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL,
+    poolclass=InstrumentedAsyncQueuePool,
+    **get_pool_arguments(settings),
+)
+
+# read replicas
+replica_engines = [
+    create_engine(url, poolclass=InstrumentedQueuePool, **get_pool_arguments(settings))
+    for url in settings.database_replica_urls
+]
+async_replica_engines = [
+    create_async_engine(
+        get_async_url(url),
+        poolclass=InstrumentedAsyncQueuePool,
+        **get_pool_arguments(settings),
+    )
+    for url in settings.database_replica_urls
+]
+
+router = ReplicaRouter(engine, replica_engines, settings.database_replica_strategy)
+async_router = ReplicaRouter(
+    async_engine.sync_engine,
+    [replica.sync_engine for replica in async_replica_engines],
+    settings.database_replica_strategy,
+)
+
+SessionLocal = sessionmaker(
+    class_=RoutingSession,
+    router=router,
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    sync_session_class=RoutingSession,
+    router=async_router,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# local database connection
+LOCAL_DATABASE_URL = f"sqlite:///{settings.local_database_path}"
+local_engine = create_engine(
+    LOCAL_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+LocalSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=local_engine)
+
+ASYNC_LOCAL_DATABASE_URL = f"sqlite+aiosqlite:///{settings.local_database_path}"
+local_async_engine = create_async_engine(ASYNC_LOCAL_DATABASE_URL)
+AsyncLocalSessionLocal = async_sessionmaker(
+    bind=local_async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+    cursor.execute(f"PRAGMA mmap_size={settings.sqlite_mmap_size}")
+    cursor.execute(f"PRAGMA cache_size={settings.sqlite_cache_size}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+event.listen(local_engine, "connect", set_sqlite_pragmas)
+event.listen(local_async_engine.sync_engine, "connect", set_sqlite_pragmas)
+
+# pool metrics, served from /internal/pool
+pool_metrics = {
+    "engine": attach_pool_metrics(engine),
+    "async_engine": attach_pool_metrics(async_engine),
+    "local_engine": attach_pool_metrics(local_engine),
+    "local_async_engine": attach_pool_metrics(local_async_engine),
+}
+
+for i, (replica, async_replica) in enumerate(
+    zip(replica_engines, async_replica_engines)
+):
+    pool_metrics[f"replica_{i}"] = attach_pool_metrics(replica)
+    pool_metrics[f"async_replica_{i}"] = attach_pool_metrics(async_replica)
+
+# per-request query counts and timings
+for instrumented_engine in [
+    engine,
+    async_engine,
+    local_engine,
+    local_async_engine,
+    *replica_engines,
+    *async_replica_engines,
+]:
+    instrument_engine(instrumented_engine)
 
 # Declarative bases
 Base = declarative_base()
@@ -40,34 +156,68 @@ def init_db():
     return roles
 
 
-def get_db():
-    db = SessionLocal()
+local_db_initialized = False
+
+
+def init_local_db():
+    """Creates the local database tables from the same metadata as the server."""
+
+    global local_db_initialized
+
+    import models
+    from utils.schema_utils import ensure_schema
+
+    # the embedded database has no one to run migrations, so it adds missing columns itself
+    ensure_schema(local_engine, Base.metadata, migrate=True)
+    local_db_initialized = True
+
+
+def get_engine(db_context: DatabaseContext = DatabaseContext.SERVER):
+    if db_context == DatabaseContext.LOCAL:
+        return local_engine
+    return engine
+
+
+def get_sessionmaker(
+    db_context: DatabaseContext = DatabaseContext.SERVER, is_async: bool = False
+):
+    """Returns the session factory of a database context. ALL uses the server database."""
+
+    if db_context == DatabaseContext.LOCAL:
+        if not local_db_initialized:
+            init_local_db()
+        return AsyncLocalSessionLocal if is_async else LocalSessionLocal
+
+    return AsyncSessionLocal if is_async else SessionLocal
+
+
+def is_read_your_writes(request: Request):
+    """Clients send X-Read-Your-Writes to keep a request's reads on the primary."""
+
+    return str_to_bool(request.headers.get("X-Read-Your-Writes", "").lower())
+
+
+def get_db(request: Request):
+    db = get_sessionmaker(get_global_database_context())()
+    if is_read_your_writes(request):
+        use_primary(db)
     try:
         yield db
     finally:
         db.close()
 
 
-def get_db_object():
-    db = SessionLocal()
-    return db
-
-
-def replace_script_with_args(args: dict, script_path: str):
-    sql_script = read_file(script_path)
-
-    if isinstance(args, dict):
-        for k, v in args.items():
-            v = str(v)
-            sql_script = sql_script.replace(f"{{{k}}}", v)
+async def get_async_db(request: Request):
+    session_factory = get_sessionmaker(get_global_database_context(), is_async=True)
+    async with session_factory() as db:
+        if is_read_your_writes(request):
+            use_primary(db)
+        yield db
 
-    with tempfile.NamedTemporaryFile(
-        delete=False, mode="w", suffix=".sql"
-    ) as temp_file:
-        temp_file.write(sql_script)
-        temp_file_path = temp_file.name
 
-    return temp_file_path
+def get_db_object(db_context: DatabaseContext = DatabaseContext.SERVER):
+    db = get_sessionmaker(db_context)()
+    return db
 
 
 def run_python_script(script_path: str, args: dict):
@@ -89,70 +239,78 @@ def run_python_script(script_path: str, args: dict):
         print("Script error output:", e.stderr)
 
 
+maintenance_engine = None
+
+
+def get_maintenance_engine():
+    """Returns an autocommit engine on the postgres database, for CREATE/DROP DATABASE."""
+
+    global maintenance_engine
+
+    if maintenance_engine is None:
+        maintenance_engine = create_engine(
+            get_connection_string(database_name="postgres"),
+            isolation_level="AUTOCOMMIT",
+        )
+
+    return maintenance_engine
+
+
+def run_sql_script(script_path: str, args: dict = None, db_engine=None):
+    """
+    Runs an SQL script statement by statement in one transaction on a pooled connection. Returns a list of (statement, seconds) timings.
+    """
+
+    if db_engine is None:
+        db_engine = engine
+
+    timings = []
+
+    with open(script_path, "r", encoding="utf-8") as script, db_engine.connect() as conn:
+        with conn.begin():
+            for statement in iter_sql_statements(script):
+                sql = substitute_placeholders(statement, args, conn.dialect)
+
+                start = time.perf_counter()
+                conn.execute(text(sql))
+                timings.append((statement, time.perf_counter() - start))
+
+    return timings
+
+
 def run_postgres_script(
     script_path: str,
     args: dict = None,
     is_super_command: bool = False,
 ):
-    global database_name, database_username, database_hostname
-
     if not os.path.exists(script_path):
         raise ValueError(f"script {script_path} does not exist.")
 
-    original_script_path = script_path
-
-    if args:
-        script_path = replace_script_with_args(args, script_path)
+    args = {"database_name": database_name, **(args or {})}
 
-    create_pg_pass("root")
-
-    script_name = os.path.basename(original_script_path)
+    script_name = os.path.basename(script_path)
     if script_name == "create_db.sql" or script_name == "drop_db.sql":
         is_super_command = True
 
-    arguments = [
-        "psql",
-        "-h",
-        database_hostname,
-        "-d",
-        database_name,
-        "-U",
-        database_username,
-        "-p",
-        database_port,
-        "<",
-        script_path,
-    ]
     if is_super_command:
-        arguments[4] = "postgres"
-
-    os.system(" ".join(arguments))
-
-
-def create_pg_pass(password: str):
-    pgpass_line = f"{database_hostname}:{database_port}:{database_name}:{database_username}:{password}\n"
-    pgpass_path = os.path.join(os.path.expanduser("~"), ".pgpass")
+        db_engine = get_maintenance_engine()
+    elif args.get("database_name") != database_name:
+        db_engine = create_engine(
+            get_connection_string(database_name=args.get("database_name"))
+        )
+    else:
+        db_engine = engine
 
-    lines = []
-    if os.path.exists(pgpass_path):
-        with open(pgpass_path, "r") as f:
-            lines = f.readlines()
+    timings = run_sql_script(script_path, args, db_engine)
 
-    updated = False
-    with open(pgpass_path, "w") as f:
-        for line in lines:
-            if line.startswith(
-                f"{database_hostname}:{database_port}:{database_name}:{database_username}:"
-            ):
-                f.write(pgpass_line)
-                updated = True
-            else:
-                f.write(line)
+    for statement, seconds in timings:
+        print(f"{seconds * 1000:8.2f} ms  {statement.splitlines()[0]}")
 
-        if not updated:
-            f.write(pgpass_line)
+    if is_super_command:
+        # pooled connections to a dropped or recreated database are stale
+        engine.dispose()
 
-    os.chmod(pgpass_path, stat.S_IRUSR | stat.S_IWUSR)
+    return timings
 
 
 def get_script_path(script: str):
@@ -162,6 +320,10 @@ def get_script_path(script: str):
 
 
 if __name__ == "__main__":
+    import uvicorn
+
+    from utils.parser import BoolArgument, Parser, Argument, PathArgument
+
     default_script_path = get_script_path(base_script)
     parser_arguments = [
         Argument(name=("-s", "--script"), default=None),
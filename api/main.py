@@ -1,26 +1,42 @@
+from contextlib import asynccontextmanager
+
 from fastapi import Depends, FastAPI, HTTPException, Header, Request, status, Response
 from fastapi.responses import JSONResponse, RedirectResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
-import uvicorn
-
-from utils.hash_utils import verify_password
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import or_, select
+
+from utils.hash_utils import HashingServiceBusy, hashing_service
+from utils.leaderboard_utils import leaderboard_service
+from utils.ingest_utils import IngestionQueueFull, score_writer
+from utils.schema_utils import ensure_schema
+from utils.query_utils import (
+    QueryStats,
+    request_query_stats,
+    warn_repeated_statements,
+)
 from utils.model_utils import (
     upsert_model_to_db,
     insert_model_to_db,
+    async_insert_model_to_db,
     convert_model_to_schema,
     convert_schema_to_model,
 )
 
 from constants import *
 
+from api import DatabaseContext, get_global_database_context
 from api.database import (
     SessionLocal,
     engine,
+    get_engine,
+    get_sessionmaker,
+    settings,
     get_db,
+    get_async_db,
     Base,
 )
 
@@ -29,14 +45,38 @@ from utils.oauth2 import (
     extract_token_from_request,
     invalidate_access_token,
     get_current_user,
+    revocation_list,
     verify_access_token,
 )
 
+import models
 from models.user import User, Role
-from api.schemas import TokenCreate, UserCreate, UserOut
+from api.schemas import TokenCreate, UserCreate, UserOut, UserSnapshot
 from api.routers.user import create_role, router as user_router
+from api.routers.internal import router as internal_router
+from api.routers.game import router as game_router
+from api.routers.language import router as language_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    db_context = get_global_database_context()
+    engine = get_engine(db_context)
+    ensure_schema(engine, Base.metadata, migrate=db_context == DatabaseContext.LOCAL)
+    leaderboard_service.start_rebuild(engine)
+    revocation_list.start()
+    hashing_service.start()
+    score_writer.start(get_sessionmaker(db_context, is_async=True))
 
-app = FastAPI()
+    yield
+
+    # write out queued scores before the connections go away
+    await score_writer.shutdown()
+    revocation_list.shutdown()
+    hashing_service.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 @app.exception_handler(IntegrityError)
@@ -45,7 +85,25 @@ async def integrity_exception_handler(request: Request, exc: IntegrityError):
     return JSONResponse(status_code=422, content=detail)
 
 
-Base.metadata.create_all(engine)
+@app.exception_handler(HashingServiceBusy)
+async def hashing_busy_exception_handler(request: Request, exc: HashingServiceBusy):
+    detail = {"detail": "Too many authentication requests, try again later"}
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=detail,
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(IngestionQueueFull)
+async def ingestion_full_exception_handler(request: Request, exc: IngestionQueueFull):
+    detail = {"detail": "Too many score submissions, try again later"}
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=detail,
+        headers={"Retry-After": "1"},
+    )
+
 
 origins = ["*"]
 app.add_middleware(
@@ -56,7 +114,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def query_stats_middleware(request: Request, call_next):
+    stats = QueryStats()
+    token = request_query_stats.set(stats)
+
+    try:
+        response = await call_next(request)
+    finally:
+        request_query_stats.reset(token)
+
+    response.headers["Server-Timing"] = stats.get_server_timing()
+    warn_repeated_statements(stats, settings.query_repeat_threshold, request.url.path)
+    return response
+
+
 app.include_router(user_router)
+app.include_router(internal_router)
+app.include_router(game_router)
+app.include_router(language_router)
 
 
 @app.get("/", tags=["Main"])
@@ -65,40 +142,49 @@ def main():
 
 
 @app.post("/register", response_model=UserOut)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    user.password = await hashing_service.hash_password(user.password)
     user_model = convert_schema_to_model(user, User)
-    user_model = create_role(db, "user", user_model)
+    user_model = await create_role(db, "user", user_model)
 
-    user_model = insert_model_to_db(db, user_model, User)
+    user_model = await async_insert_model_to_db(db, user_model, User)
     return user_model
 
 
 @app.post("/login", tags=["Main"], response_model=TokenCreate)
-def login(
+async def login(
     user_credentials: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
 
-    user = (
-        db.query(User)
+    result = await db.execute(
+        select(User)
+        .options(selectinload(User.roles))
         .filter(
             User.username == user_credentials.username,
         )
-        .first()
     )
+    user = result.scalars().first()
 
     if not user:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail=f"Invalid Credentials"
         )
 
-    if not verify_password(user_credentials.password, user.password):
+    if not await hashing_service.verify_password(
+        user_credentials.password, user.password
+    ):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail=f"Invalid Credentials"
         )
 
+    # upgrade hashes created with an outdated cost
+    if hashing_service.needs_rehash(user.password):
+        user.password = await hashing_service.hash_password(user_credentials.password)
+        await db.commit()
+
     # create a token
-    access_token = create_access_token(data={"user_id": user.id})
+    access_token = create_access_token(data={"user_id": user.id}, user=user)
     return {"access_token": access_token, "token_type": "bearer"}
 
 
@@ -106,18 +192,20 @@ def login(
 async def logout(
     request: Request,
     response: Response,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    user: UserSnapshot = Depends(get_current_user),
 ):
     # Invalidate the token
     token = extract_token_from_request(request)
 
     if token:
-        invalidate_access_token(token)
+        await invalidate_access_token(token)
         response.delete_cookie("access_token")
 
     return {"message": "Successfully logged out"}
 
 
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run("api.main:app", reload=True, log_level="debug")
@@ -0,0 +1,10 @@
+# Importing any model loads them all, so Base.metadata always holds the complete
+# schema (foreign keys resolve, and ensure_schema fingerprints every table).
+from models.game import Game, GameScore, game_user_association
+from models.user import Role, User, user_roles
+from models.image import Image
+from models.language import Language
+from models.word import Word
+from models.review import ReviewState
+from models.revoked_token import RevokedToken
+from models.schema_version import SchemaVersion
@@ -1,3 +1,5 @@
+import uuid
+
 from sqlalchemy import Column, Enum, ForeignKey, String, Integer, Table
 from sqlalchemy.orm import relationship
 from api.database import Base
@@ -8,14 +10,16 @@ game_user_association = Table(
     "game_user_association",
     Base.metadata,
     Column("game_id", String, ForeignKey("games.id"), primary_key=True),
-    Column("user_id", String, ForeignKey("users.id"), primary_key=True),
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
 )
 
 
 class GameScore(Base):
     __tablename__ = "game_scores"
-    id = Column(String, primary_key=True, nullable=False)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    id = Column(
+        String, primary_key=True, nullable=False, default=lambda: uuid.uuid4().hex
+    )
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     game_id = Column(String, ForeignKey("games.id"), nullable=False)
     score = Column(Integer, nullable=False)
     user = relationship("User", back_populates="scores")
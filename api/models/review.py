@@ -0,0 +1,31 @@
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    UniqueConstraint,
+    func,
+)
+from api.database import Base
+
+
+class ReviewState(Base):
+    """Spaced-repetition state of a word for a user, see utils/review_utils."""
+
+    __tablename__ = "review_states"
+    __table_args__ = (
+        UniqueConstraint("user_id", "word_id", name="uq_review_states_user_id_word_id"),
+        # next due words of a user are read in due order
+        Index("ix_review_states_user_id_due_at", "user_id", "due_at"),
+    )
+
+    id = Column(Integer, autoincrement=True, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    word_id = Column(Integer, ForeignKey("words.id"), nullable=False)
+    ease = Column(Float, nullable=False, default=2.5)
+    interval = Column(Integer, nullable=False, default=0)  # days
+    repetitions = Column(Integer, nullable=False, default=0)
+    due_at = Column(DateTime, nullable=False, server_default=func.now())
+    reviewed_at = Column(DateTime, nullable=True)
@@ -0,0 +1,9 @@
+from sqlalchemy import Column, DateTime, String
+from api.database import Base
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(64), primary_key=True, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, DateTime, String, func
+from api.database import Base
+
+
+class SchemaVersion(Base):
+    __tablename__ = "schema_versions"
+
+    name = Column(String(64), primary_key=True, nullable=False)
+    fingerprint = Column(String(64), nullable=False)
+    updated_at = Column(DateTime, nullable=False, server_default=func.now())
@@ -1,11 +1,9 @@
 import datetime
-from fastapi import requests
 from sqlalchemy import Integer, Table, Column, String, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from constants import *
-import requests
 from api.database import Base
-from game import game_user_association
+from models.game import game_user_association
 
 user_roles = Table(
     "user_roles",
@@ -32,10 +30,11 @@ class Role(Base):
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(Integer, primary_key=True, autoincrement=True, nullable=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     username = Column(String(50), nullable=False, unique=True)
     password = Column(String(255), nullable=False)
     token = Column(String(255), nullable=True)
+    role_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     created_at = Column(DateTime, default=datetime.datetime.now(datetime.UTC))
     roles = relationship("Role", secondary=user_roles, back_populates="users")
@@ -55,6 +54,8 @@ class User(Base):
         )
 
     def login(self):
+        import requests
+
         response = requests.post(
             f"{BASE_URL}/login",
             data={"username": self.username, "password": self.password},
@@ -66,6 +67,8 @@ class User(Base):
         return self.token
 
     def logout(self):
+        import requests
+
         headers = {"Authorization": f"Bearer {self.token}"}
         response = requests.post(f"{BASE_URL}/logout", headers=headers)
         self.token = None
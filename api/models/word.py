@@ -1,13 +1,17 @@
-from unittest.mock import Base
-from fastapi import requests
-from sqlalchemy import Integer, Table, Column, String, DateTime, ForeignKey
+from sqlalchemy import Integer, Index, Table, Column, String, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
+from api.database import Base
 from constants import *
 
 
 class Word(Base):
     __tablename__ = "words"
+    __table_args__ = (
+        # top-N words of a language, see utils/word_index_utils
+        Index("ix_words_language_id_rank", "language_id", "rank"),
+    )
 
     id = Column(Integer, autoincrement=True, primary_key=True)
     word = Column(String, nullable=False)
-    language_id = Column(String)
+    language_id = Column(String, ForeignKey("languages.id"))
+    rank = Column(Integer, nullable=True)  # 1 is the most frequent word
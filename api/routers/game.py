@@ -1,15 +1,30 @@
+import uuid
+
 from fastapi import APIRouter
-from api.database import get_db
+from api.database import get_db, get_async_db
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import any_
-from api.schemas import RoleOut, UserCreate, UserOut, RoleCreate
+from api.schemas import (
+    DueWordOut,
+    GameCreate,
+    GameScoreCreate,
+    GameScoreOut,
+    LeaderboardOut,
+    ReviewCreate,
+    ReviewOut,
+    UserSnapshot,
+)
+from enums import GameType
 from utils.oauth2 import get_current_user_with_roles, get_current_user
-from utils.model_utils import insert_model_to_db, upsert_model_to_db
+from utils.leaderboard_utils import leaderboard_service
+from utils.ingest_utils import score_writer
+from utils.review_utils import review_scheduler
 from models.user import User, Role
-from models.game import Game
-from schemas import GameCreate
+from models.game import Game, GameScore
+from models.word import Word
 
 router = APIRouter(prefix="/games", tags=["Games"])
 
@@ -22,3 +37,119 @@ def get_games(db: Session = Depends(get_db)):
 @router.post("/")
 def create_game(game: GameCreate, db: Session = Depends(get_db)):
     return
+
+
+@router.post(
+    "/{game_id}/scores",
+    response_model=GameScoreOut,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def create_game_score(
+    game_id: str,
+    game_score: GameScoreCreate,
+    db: AsyncSession = Depends(get_async_db),
+    user: UserSnapshot = Depends(get_current_user),
+):
+    game = await db.get(Game, game_id)
+    if game is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Game not found")
+
+    # written in batches by score_writer, the response only confirms it was queued.
+    # The leaderboard picks the score up once it has been stored.
+    row = {
+        "id": uuid.uuid4().hex,
+        "user_id": user.id,
+        "game_id": game_id,
+        "score": game_score.score,
+    }
+    leaderboard_service.set_game_type(game_id, game.game_type)
+    await score_writer.put(row)
+
+    return row
+
+
+@router.get("/{game_id}/leaderboard", response_model=LeaderboardOut)
+async def get_game_leaderboard(
+    game_id: str,
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    """Served from this process's in-memory leaderboard, see LeaderboardService."""
+
+    leaderboard = leaderboard_service.get_game(game_id)
+    return {
+        "items": leaderboard.get_range(offset, offset + limit),
+        "total": len(leaderboard),
+    }
+
+
+@router.get("/{game_id}/leaderboard/users/{user_id}", response_model=LeaderboardOut)
+async def get_game_leaderboard_neighbors(
+    game_id: str,
+    user_id: int,
+    neighbors: int = Query(5, ge=0, le=50),
+):
+    leaderboard = leaderboard_service.get_game(game_id)
+    items = leaderboard.get_neighbors(user_id, neighbors)
+
+    if items is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User has no score"
+        )
+
+    return {"items": items, "total": len(leaderboard)}
+
+
+@router.get("/types/{game_type}/leaderboard", response_model=LeaderboardOut)
+async def get_game_type_leaderboard(
+    game_type: GameType,
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    leaderboard = leaderboard_service.get_game_type(game_type)
+    return {
+        "items": leaderboard.get_range(offset, offset + limit),
+        "total": len(leaderboard),
+    }
+
+
+@router.get(
+    "/types/{game_type}/leaderboard/users/{user_id}", response_model=LeaderboardOut
+)
+async def get_game_type_leaderboard_neighbors(
+    game_type: GameType,
+    user_id: int,
+    neighbors: int = Query(5, ge=0, le=50),
+):
+    leaderboard = leaderboard_service.get_game_type(game_type)
+    items = leaderboard.get_neighbors(user_id, neighbors)
+
+    if items is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User has no score"
+        )
+
+    return {"items": items, "total": len(leaderboard)}
+
+
+@router.get("/reviews/due", response_model=List[DueWordOut])
+async def get_due_reviews(
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    user: UserSnapshot = Depends(get_current_user),
+):
+    due = await review_scheduler.get_due(db, user.id, limit)
+    return [{"word_id": word_id, "due_at": due_at} for word_id, due_at in due]
+
+
+@router.post("/reviews/{word_id}", response_model=ReviewOut)
+async def create_review(
+    word_id: int,
+    review: ReviewCreate,
+    db: AsyncSession = Depends(get_async_db),
+    user: UserSnapshot = Depends(get_current_user),
+):
+    if await db.get(Word, word_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Word not found")
+
+    return await review_scheduler.review(db, user.id, word_id, review.quality)
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends
+from api.database import pool_metrics
+from utils.oauth2 import get_current_user_with_roles, principal_cache
+from utils.page_utils import count_cache
+from utils.leaderboard_utils import leaderboard_service
+from utils.ingest_utils import score_writer
+from utils.review_utils import review_scheduler
+from utils.word_index_utils import word_index_store
+from utils.sampler_utils import sampler_service
+from api.schemas import UserSnapshot
+
+router = APIRouter(prefix="/internal", tags=["Internal"])
+
+
+@router.get("/pool")
+def get_pool_metrics(user: UserSnapshot = Depends(get_current_user_with_roles())):
+    return {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
+
+
+@router.get("/cache")
+def get_cache_metrics(user: UserSnapshot = Depends(get_current_user_with_roles())):
+    return {
+        "principal_cache": principal_cache.stats(),
+        "count_cache": count_cache.stats(),
+        "leaderboards": leaderboard_service.stats(),
+        "score_writer": score_writer.stats(),
+        "review_queues": review_scheduler.stats(),
+        "word_indexes": word_index_store.stats(),
+        "word_samplers": sampler_service.stats(),
+    }
@@ -4,9 +4,11 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from sqlalchemy import any_
-from api.schemas import RoleOut, UserCreate, UserOut, RoleCreate
+from api.schemas import RoleOut, UserCreate, UserOut, RoleCreate, WordOut
 from utils.oauth2 import get_current_user_with_roles, get_current_user
 from utils.model_utils import insert_model_to_db, upsert_model_to_db
+from utils.word_index_utils import word_index_store
+from utils.sampler_utils import sampler_service
 from models.user import User, Role
 
 router = APIRouter(prefix="/languages", tags=["Languages"])
@@ -20,3 +22,56 @@ def get_language(db: Session = Depends(get_db)):
 @router.post("/")
 def create_language(db: Session = Depends(get_db)):
     return
+
+
+@router.get("/{language_id}/words", response_model=List[WordOut])
+def get_top_words(
+    language_id: str,
+    limit: int = Query(100, ge=1, le=10000),
+    offset: int = Query(0, ge=0),
+):
+    index = word_index_store.get(language_id)
+    if index is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Word index not built"
+        )
+
+    return [
+        {"id": word_id, "word": word, "rank": offset + position + 1}
+        for position, (word_id, word) in enumerate(
+            index.get_words(offset, offset + limit)
+        )
+    ]
+
+
+@router.get("/{language_id}/words/sample", response_model=List[WordOut])
+def sample_words(
+    language_id: str,
+    size: int = Query(10, ge=1, le=1000),
+    top: int = Query(100, ge=1),
+    offset: int = Query(0, ge=0),
+    replace: bool = Query(True),
+    seed: Optional[int] = Query(None),
+):
+    """Draws words ranked offset + 1 to offset + top, weighted by their frequency."""
+
+    sampler = sampler_service.get(language_id, offset, offset + top)
+    if sampler is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="No words to sample"
+        )
+
+    try:
+        positions = sampler.sample_positions(size, replace, seed)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    index = sampler.index
+    return [
+        {
+            "id": int(index.ids[position]),
+            "word": index.get_word(position),
+            "rank": int(position) + 1,
+        }
+        for position in positions
+    ]
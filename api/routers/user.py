@@ -1,18 +1,26 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
-from sqlalchemy import any_
-from api.schemas import RoleOut, UserCreate, UserOut, RoleCreate
-from utils.oauth2 import get_current_user_with_roles, get_current_user
-from utils.model_utils import insert_model_to_db, upsert_model_to_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from api.schemas import Page, RoleOut, UserCreate, UserOut, RoleCreate, UserSnapshot
+from utils.oauth2 import (
+    bump_role_version,
+    forget_user,
+    get_current_user_with_roles,
+    get_current_user,
+)
+from utils.model_utils import async_insert_model_to_db, async_upsert_model_to_db
+from utils.page_utils import async_paginate
 from models.user import User, Role
-from api.database import get_db
+from api.database import get_async_db
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
-def create_role(db: Session, role_name: str, user_model: User):
-    role = db.query(Role).filter(Role.name == role_name).first()
+async def create_role(db: AsyncSession, role_name: str, user_model: User):
+    result = await db.execute(select(Role).filter(Role.name == role_name))
+    role = result.scalars().first()
 
     if role:
         user_model.roles.append(role)
@@ -21,45 +29,52 @@ def create_role(db: Session, role_name: str, user_model: User):
         new_role = Role(name=role_name)
 
         db.add(new_role)
-        db.commit()
+        await db.commit()
         user_model.roles.append(new_role)
 
     return user_model
 
 
-@router.get("/", response_model=List[UserOut])
+@router.get("/", response_model=Page[UserOut])
 async def get_users(
-    user_id: Optional[str] = Query(None),
+    user_id: Optional[int] = Query(None),
     role_name: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user_with_roles()),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    with_total: bool = Query(False),
+    db: AsyncSession = Depends(get_async_db),
+    user: UserSnapshot = Depends(get_current_user_with_roles()),
 ):
-    query = db.query(User)
+    query = select(User)
 
     if user_id:
         query = query.filter(User.id == user_id)
 
     if role_name:
-        query = query.filter(role_name == any_(User.roles))
+        query = query.filter(User.roles.any(Role.name == role_name))
 
-    return query.all()
+    return await async_paginate(db, query, [User.id], cursor, limit, with_total)
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(
-    user_id: str,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+async def delete_user(
+    user_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user: UserSnapshot = Depends(get_current_user),
 ):
-    print(user.roles)
-    if user.id == user_id or user.roles == ["admin"]:
-        pass
-
-    user = db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(
+        select(User)
+        .options(
+            selectinload(User.roles), selectinload(User.games), selectinload(User.scores)
+        )
+        .filter(User.id == user_id)
+    )
+    user = result.scalars().first()
 
     if user:
-        user.delete(synchronize_session=False)
-        db.commit()
+        await db.delete(user)
+        await db.commit()
+        forget_user(user_id)
         return user_id
 
     raise HTTPException(status_code=404)
@@ -69,10 +84,15 @@ def delete_user(
     "/{user_id}/roles",
     response_model=List[RoleOut],
 )
-def get_user_roles(
-    user_id: int, db: Session = Depends(get_db), user: User = Depends(get_current_user)
+async def get_user_roles(
+    user_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user: UserSnapshot = Depends(get_current_user),
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(
+        select(User).options(selectinload(User.roles)).filter(User.id == user_id)
+    )
+    user = result.scalars().first()
 
     if not user:
         raise HTTPException(
@@ -88,13 +108,16 @@ def get_user_roles(
     status_code=status.HTTP_201_CREATED,
     response_model=List[RoleOut],
 )
-def create_user_role(
+async def create_user_role(
     user_id: int,
     role: RoleCreate,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user_with_roles()),
+    db: AsyncSession = Depends(get_async_db),
+    user: UserSnapshot = Depends(get_current_user_with_roles()),
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(
+        select(User).options(selectinload(User.roles)).filter(User.id == user_id)
+    )
+    user = result.scalars().first()
 
     if not user:
         raise HTTPException(
@@ -102,6 +125,7 @@ def create_user_role(
             detail=f"User not found.",
         )
 
-    user = create_role(db, role.name, user)
-    user = upsert_model_to_db(db, user, User, (User.id == user.id))
+    user = await create_role(db, role.name, user)
+    user = await async_upsert_model_to_db(db, user, User, (User.id == user.id))
+    await bump_role_version(db, user)
     return user.roles
@@ -1,9 +1,18 @@
 from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime, date
-from typing import Optional, List
+from typing import Generic, Optional, List, Tuple, TypeVar
 from enums import GameType
 
 
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
 class RoleCreate(BaseModel):
     name: str = None
 
@@ -43,11 +52,34 @@ class TokenCreate(BaseModel):
 
 class TokenData(BaseModel):
     id: Optional[str] = None
+    exp: Optional[int] = None
+    jti: Optional[str] = None
+    username: Optional[str] = None
+    roles: List[str] = []
+    role_version: Optional[int] = None
+
+
+class RoleSnapshot(BaseModel):
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
+    id: Optional[int] = None
+    name: str = None
+
+
+class UserSnapshot(BaseModel):
+    """Detached, read-only view of an authenticated user."""
+
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
+    id: int
+    username: str
+    roles: Tuple[RoleSnapshot, ...] = ()
+    role_version: Optional[int] = None
 
 
 class GameCreate(BaseModel):
     id: Optional[int] = None
-    game_type = GameType.WORDS
+    game_type: GameType = GameType.WORDS
     users: List[UserBase]
     frequency: int = 100
 
@@ -58,3 +90,50 @@ class GameOut(BaseModel):
     users: List[UserBase]
     frequency: int
     score: int
+
+
+class GameScoreCreate(BaseModel):
+    score: int
+
+
+class GameScoreOut(BaseModel):
+    id: str
+    user_id: int
+    game_id: str
+    score: int
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    user_id: int
+    score: int
+
+
+class LeaderboardOut(BaseModel):
+    items: List[LeaderboardEntry]
+    total: int
+
+
+class ReviewCreate(BaseModel):
+    quality: int = Field(ge=0, le=5)
+
+
+class ReviewOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    word_id: int
+    ease: float
+    interval: int
+    repetitions: int
+    due_at: datetime
+
+
+class DueWordOut(BaseModel):
+    word_id: int
+    due_at: datetime
+
+
+class WordOut(BaseModel):
+    id: int
+    word: str
+    rank: int
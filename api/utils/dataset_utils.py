@@ -0,0 +1,310 @@
+import time
+from datetime import date, datetime
+
+from sqlalchemy import Enum
+
+from utils.load_utils import LoadResult, load_columns, reset_sequence
+from utils.random_utils import (
+    get_random_generator,
+    random_bool_array,
+    random_date_array,
+    random_datetime_array,
+    random_float_array,
+    random_int_array,
+    random_string_array,
+)
+
+# rows per table of each size profile, tables left out stay empty
+profiles = {
+    "small": {
+        "roles": 2,
+        "users": 1000,
+        "user_roles": 1000,
+        "languages": 5,
+        "words": 10000,
+        "images": 500,
+        "games": 20,
+        "game_user_association": 2000,
+        "game_scores": 50000,
+    },
+    "medium": {
+        "roles": 2,
+        "users": 50000,
+        "user_roles": 50000,
+        "languages": 20,
+        "words": 200000,
+        "images": 10000,
+        "games": 500,
+        "game_user_association": 100000,
+        "game_scores": 1000000,
+    },
+    "large": {
+        "roles": 2,
+        "users": 500000,
+        "user_roles": 500000,
+        "languages": 50,
+        "words": 2000000,
+        "images": 100000,
+        "games": 2000,
+        "game_user_association": 1000000,
+        "game_scores": 10000000,
+    },
+}
+
+# "table.column" -> how values are drawn. Foreign keys default to uniform
+# sampling over the parent keys, other columns to the ranges of random_utils.
+column_distributions = {
+    "roles.name": ("values", ["user", "admin"]),
+    # a few users and games produce most of the scores
+    "game_scores.user_id": ("zipf", 1.1),
+    "game_scores.game_id": ("zipf", 1.1),
+    "game_scores.score": ("power_law", 1.5),
+    # a few languages hold most of the words
+    "words.language_id": ("zipf", 1.2),
+    # word lengths cluster around short words
+    "words.word": ("zipf_length", 2.0),
+    # frequency rank within the word's language: a permutation of 1..n per language
+    "words.rank": ("group_rank", "language_id"),
+}
+
+
+def get_zipf_probabilities(size: int, exponent: float):
+    import numpy as np
+
+    weights = 1.0 / np.arange(1, size + 1) ** exponent
+    return weights / weights.sum()
+
+
+def get_table_keys(table, size: int):
+    """Primary key values of a generated table, 1..size (as strings for string keys)."""
+
+    import numpy as np
+
+    keys = np.arange(1, size + 1)
+    primary_key = list(table.primary_key.columns)[0]
+
+    if primary_key.type.python_type is str:
+        return keys.astype(str)
+    return keys
+
+
+class ForeignKeySampler:
+    """Draws values of a foreign key column from the keys of its parent table."""
+
+    def __init__(self, parent_keys, rng, distribution=None) -> None:
+        self.rng = rng
+        self.parent_keys = parent_keys
+        self.probabilities = None
+
+        if distribution and distribution[0] == "zipf":
+            # rank parents randomly so popular rows aren't always the lowest ids
+            self.parent_keys = rng.permutation(parent_keys)
+            self.probabilities = get_zipf_probabilities(len(parent_keys), distribution[1])
+
+    def sample(self, size: int):
+        return self.rng.choice(self.parent_keys, size=size, p=self.probabilities)
+
+
+def get_group_ranks(groups, rng):
+    """Random ranks 1..n within each group of equal values, so every group gets a full permutation."""
+
+    import numpy as np
+
+    groups = np.asarray(groups)
+    size = len(groups)
+
+    # shuffle, then stable-sort by group: rows of a group end up in random order
+    order = rng.permutation(size)
+    order = order[np.argsort(groups[order], kind="stable")]
+
+    sorted_groups = groups[order]
+    starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+    counts = np.diff(np.r_[starts, size])
+
+    ranks = np.empty(size, dtype=np.int64)
+    ranks[order] = np.arange(size) - np.repeat(starts, counts) + 1
+    return ranks
+
+
+def generate_column(column, size: int, rng, distribution=None):
+    """Values for a column that is neither a primary nor a foreign key."""
+
+    import numpy as np
+
+    if distribution and distribution[0] == "power_law":
+        return (rng.pareto(distribution[1], size=size) * 100).astype(np.int64)
+
+    if distribution and distribution[0] == "zipf_length":
+        lengths = np.minimum(rng.zipf(distribution[1], size=size) + 2, 20)
+        return random_string_array(rng, size, 20, lengths)
+
+    if distribution and distribution[0] == "values":
+        return np.resize(np.array(distribution[1]), size)
+
+    if isinstance(column.type, Enum):
+        return rng.choice(np.array(column.type.enums), size=size)
+
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        python_type = None
+
+    if python_type is str:
+        length = min(getattr(column.type, "length", None) or 10, 10)
+        return random_string_array(rng, size, length)
+    if python_type is int:
+        return random_int_array(rng, size)
+    if python_type is float:
+        return random_float_array(rng, size)
+    if python_type is bool:
+        return random_bool_array(rng, size)
+    if python_type is datetime:
+        return random_datetime_array(rng, size)
+    if python_type is date:
+        return random_date_array(rng, size)
+
+    # unsupported types are left NULL
+    return np.full(size, None, dtype=object)
+
+
+def get_foreign_key_columns(table):
+    return {
+        column.name: next(iter(column.foreign_keys)).column.table.name
+        for column in table.columns
+        if column.foreign_keys
+    }
+
+
+def sample_unique_pairs(size: int, samplers: dict, rng):
+    """
+    Rows of an association table whose primary key is two foreign keys, without duplicate pairs.
+    """
+
+    (first, first_sampler), (second, second_sampler) = samplers.items()
+    first_keys = first_sampler.parent_keys
+    second_keys = second_sampler.parent_keys
+
+    size = min(size, len(first_keys) * len(second_keys))
+    pairs = rng.choice(len(first_keys) * len(second_keys), size=size, replace=False)
+
+    return {
+        first: first_keys[pairs // len(second_keys)],
+        second: second_keys[pairs % len(second_keys)],
+    }
+
+
+def iter_table_chunks(table, size: int, samplers: dict, rng, chunk_size: int):
+    """Yields column arrays of a generated table, `chunk_size` rows at a time."""
+
+    primary_keys = [column.name for column in table.primary_key.columns]
+    is_association = len(primary_keys) > 1 and set(primary_keys) <= set(samplers)
+
+    if is_association:
+        # pairs are drawn up front so they stay unique across chunks
+        pair_columns = sample_unique_pairs(size, samplers, rng)
+        size = len(next(iter(pair_columns.values())))
+    else:
+        keys = get_table_keys(table, size)
+
+    # columns that depend on every row of the table are drawn up front
+    full_columns = {}
+    for column in table.columns:
+        distribution = column_distributions.get(f"{table.name}.{column.name}")
+        if not distribution or distribution[0] != "group_rank":
+            continue
+
+        group = distribution[1]
+        if group not in full_columns:
+            group_column = table.columns[group]
+            full_columns[group] = (
+                samplers[group].sample(size)
+                if group in samplers
+                else generate_column(
+                    group_column,
+                    size,
+                    rng,
+                    column_distributions.get(f"{table.name}.{group}"),
+                )
+            )
+        full_columns[column.name] = get_group_ranks(full_columns[group], rng)
+
+    for start in range(0, size, chunk_size):
+        chunk = min(chunk_size, size - start)
+        columns = {}
+
+        for column in table.columns:
+            name = f"{table.name}.{column.name}"
+
+            if is_association and column.name in pair_columns:
+                columns[column.name] = pair_columns[column.name][start : start + chunk]
+            elif column.name in full_columns:
+                columns[column.name] = full_columns[column.name][start : start + chunk]
+            elif not is_association and column.primary_key:
+                columns[column.name] = keys[start : start + chunk]
+            elif column.name in samplers:
+                columns[column.name] = samplers[column.name].sample(chunk)
+            else:
+                columns[column.name] = generate_column(
+                    column, chunk, rng, column_distributions.get(name)
+                )
+
+        yield columns
+
+
+def generate_dataset(
+    engine,
+    metadata,
+    profile: str = "small",
+    seed: int = None,
+    chunk_size: int = 50000,
+) -> dict:
+    """
+    Fills the tables of a profile in dependency order. Primary keys are 1..n, and foreign keys are sampled from the parent's keys, so every row references an existing parent. Expects empty tables.
+    Returns a LoadResult per table.
+    """
+
+    if profile not in profiles:
+        raise ValueError(f"Invalid profile: {profile}")
+
+    counts = profiles[profile]
+    rng = get_random_generator(seed)
+
+    table_keys = {}
+    results = {}
+
+    for table in metadata.sorted_tables:
+        size = counts.get(table.name, 0)
+        if not size:
+            continue
+
+        foreign_keys = get_foreign_key_columns(table)
+        missing = [parent for parent in foreign_keys.values() if parent not in table_keys]
+        if missing:
+            raise ValueError(f"{table.name} references tables without rows: {missing}")
+
+        samplers = {
+            name: ForeignKeySampler(
+                table_keys[parent],
+                rng,
+                column_distributions.get(f"{table.name}.{name}"),
+            )
+            for name, parent in foreign_keys.items()
+        }
+
+        start = time.perf_counter()
+        result = LoadResult()
+        row = 0
+
+        for columns in iter_table_chunks(table, size, samplers, rng, chunk_size):
+            result.merge(load_columns(engine, table, columns, first_row=row))
+            row += len(next(iter(columns.values())))
+
+        reset_sequence(engine, table)
+
+        result.seconds = time.perf_counter() - start
+        results[table.name] = result
+
+        if len(table.primary_key.columns) == 1:
+            table_keys[table.name] = get_table_keys(table, size)
+
+    return results
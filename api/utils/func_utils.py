@@ -1,19 +1,6 @@
 from inspect import Parameter, getmembers, signature
 from typing import Any, List, get_type_hints
 
-from sqlalchemy import (
-    Boolean,
-    Column,
-    Date,
-    DateTime,
-    Enum,
-    Float,
-    Integer,
-    String,
-    Tuple,
-)
-from sqlalchemy.ext.hybrid import hybrid_property
-
 
 def get_class_args(cls) -> dict:
 
@@ -28,6 +15,8 @@ def get_class_args(cls) -> dict:
 
 
 def is_hybrid_property(cls, attr_name: str):
+    from sqlalchemy.ext.hybrid import hybrid_property
+
     model_attr = getattr(cls, attr_name)
     val = getattr(model_attr, "descriptor", None)
     return isinstance(val, hybrid_property) if val else False
@@ -138,39 +127,7 @@ def get_object_of_type(
 
 
 def get_class_fields_and_types(cls):
-    from sqlalchemy.inspection import inspect
-
-    field_names = []
-    field_types = []
-
-    mapper = inspect(cls)
-    for column in mapper.columns:
-
-        column_name = column.key
-        # Map column types to Python types manually
-        if isinstance(column.type, String):
-            column_type = str
-        elif isinstance(column.type, Integer):
-            column_type = int
-        elif isinstance(column.type, Boolean):
-            column_type = bool
-        elif isinstance(column.type, Float):
-            column_type = float
-        elif isinstance(column.type, Date):
-            column_type = str  # Date might be converted to string
-        elif isinstance(column.type, DateTime):
-            column_type = str  # DateTime might be converted to string
-        elif isinstance(column.type, Enum):
-            column_type = str  # Enum is usually mapped to string
-        else:
-            # Default to Any if we can't determine the type
-            column_type = Any
-
-        if column_name.startswith("_"):  # this is a hybrid property
-            column_name = column_name.replace("_", "", 1)
-
-        if column.primary_key and "id" in column.key:
-            continue
-        field_names.append(column_name)
-        field_types.append(column_type)
-    return field_names, field_types
+    from utils.metadata_utils import get_model_metadata
+
+    metadata = get_model_metadata(cls)
+    return list(metadata.field_names), list(metadata.field_types)
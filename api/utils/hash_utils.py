@@ -1,11 +1,16 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
 import bcrypt
 import os
 import base64
+import time
 
+from api.config import Settings
 
-def hash_password(password: str):
+
+def hash_password(password: str, rounds: int = 12):
     pwd_bytes = password.encode("utf-8")
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds)
     hashed_bytes = bcrypt.hashpw(pwd_bytes, salt=salt)
     hashed_password = base64.b64encode(hashed_bytes).decode("utf-8")
 
@@ -15,7 +20,7 @@ def hash_password(password: str):
 def verify_password(plain_password: str, hashed_password: str):
     try:
         hashed_bytes = base64.b64decode(hashed_password.encode("utf-8"))
-    except:
+    except ValueError:  # binascii.Error
         return False
 
     try:
@@ -24,3 +29,125 @@ def verify_password(plain_password: str, hashed_password: str):
 
     except ValueError:
         return False
+
+
+def get_password_rounds(hashed_password: str):
+    """Returns the bcrypt cost of a stored hash, or None if it can't be parsed."""
+
+    try:
+        hashed_bytes = base64.b64decode(hashed_password.encode("utf-8"))
+        return int(hashed_bytes.split(b"$")[2])
+    except (ValueError, IndexError):
+        return None
+
+
+def calibrate_rounds(target_seconds: float, min_rounds: int = 12, max_rounds: int = 15):
+    """
+    Returns the highest bcrypt cost whose hashing time stays within the target. It never goes below `min_rounds`, which defaults to the cost of existing hashes, so calibration can only raise the cost.
+    """
+
+    rounds = min_rounds
+
+    for r in range(min_rounds, max_rounds + 1):
+        start = time.perf_counter()
+        bcrypt.hashpw(b"calibration", bcrypt.gensalt(rounds=r))
+        elapsed = time.perf_counter() - start
+
+        if elapsed > target_seconds:
+            break
+
+        rounds = r
+
+        # every extra round doubles the cost
+        if elapsed * 2 > target_seconds:
+            break
+
+    return rounds
+
+
+class HashingServiceBusy(Exception):
+    pass
+
+
+class HashingService:
+    """
+    Runs bcrypt on a dedicated process pool so password hashing never occupies the shared threadpool.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_queue_depth: int = 32,
+        target_seconds: float = 0.25,
+        min_rounds: int = 12,
+        max_rounds: int = 15,
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.target_seconds = target_seconds
+        self.min_rounds = min_rounds
+        self.max_rounds = max_rounds
+
+        self.rounds = 12
+        self.pending = 0
+        self.executor = None
+
+    def start(self, calibrate: bool = True):
+        """
+        Starts the pool. Calibration runs on the pool in the background, and hashes use the default cost until it finishes, so startup never waits for it.
+        """
+
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        if calibrate:
+            future = self.executor.submit(
+                calibrate_rounds, self.target_seconds, self.min_rounds, self.max_rounds
+            )
+            future.add_done_callback(self.set_calibrated_rounds)
+            return future
+
+    def set_calibrated_rounds(self, future):
+        if not future.cancelled() and future.exception() is None:
+            self.rounds = future.result()
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+
+    async def run(self, func, *args):
+        """Runs `func` on the pool. Raises HashingServiceBusy once the queue depth limit is reached."""
+
+        if self.pending >= self.max_queue_depth:
+            raise HashingServiceBusy()
+
+        if self.executor is None:
+            self.start(calibrate=False)
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            self.pending -= 1
+
+    async def hash_password(self, password: str):
+        return await self.run(hash_password, password, self.rounds)
+
+    async def verify_password(self, plain_password: str, hashed_password: str):
+        return await self.run(verify_password, plain_password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str):
+        rounds = get_password_rounds(hashed_password)
+        return rounds is not None and rounds < self.rounds
+
+
+settings = Settings()
+hashing_service = HashingService(
+    max_workers=settings.hashing_max_workers,
+    max_queue_depth=settings.hashing_max_queue_depth,
+    target_seconds=settings.hashing_target_seconds,
+    min_rounds=settings.bcrypt_min_rounds,
+    max_rounds=settings.bcrypt_max_rounds,
+)
@@ -0,0 +1,187 @@
+import asyncio
+import logging
+
+from sqlalchemy import insert
+
+from api.config import Settings
+from models.game import GameScore
+from utils.leaderboard_utils import leaderboard_service
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionQueueFull(Exception):
+    pass
+
+
+class BufferedWriter:
+    """
+    Write-behind buffer for one model. Handlers queue row dicts, and a background task inserts them with one multi-row INSERT per batch of `batch_size` rows or per `flush_interval` seconds, whichever comes first.
+    `on_written` is called with the rows of every successful write, so derived state only ever reflects stored rows.
+    """
+
+    def __init__(
+        self,
+        model_type: type,
+        batch_size: int = 500,
+        flush_interval: float = 0.05,
+        max_queue_size: int = 10000,
+        put_timeout: float = 0.1,
+        max_retries: int = 3,
+        on_written=None,
+    ) -> None:
+        self.model_type = model_type
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.put_timeout = put_timeout
+        self.max_retries = max_retries
+        self.on_written = on_written
+
+        self.session_factory = None
+        self.queue = None
+        self.task = None
+
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+
+    def start(self, session_factory):
+        """Starts the flusher on the running event loop, writing through sessions of `session_factory`."""
+
+        self.session_factory = session_factory
+
+        if self.task is None:
+            self.queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self.task = asyncio.create_task(self.run())
+
+    async def shutdown(self):
+        """Waits until every queued row has been written, then stops the flusher."""
+
+        if self.task is None:
+            return
+
+        await self.queue.join()
+        self.task.cancel()
+
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+
+        self.task = None
+
+    async def put(self, row: dict):
+        """Queues a row. Raises IngestionQueueFull when the queue stays full for `put_timeout` seconds."""
+
+        if self.task is None:
+            raise RuntimeError(f"{type(self).__name__} has not been started")
+
+        try:
+            await asyncio.wait_for(self.queue.put(row), self.put_timeout)
+        except asyncio.TimeoutError:
+            raise IngestionQueueFull()
+
+    async def get_batch(self) -> list:
+        """Waits for a row, then collects rows until the batch is full or the flush interval has passed."""
+
+        batch = [await self.queue.get()]
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+
+        while len(batch) < self.batch_size:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def write_batch(self, batch: list):
+        async with self.session_factory() as db:
+            await db.execute(insert(self.model_type), batch)
+            await db.commit()
+
+    def mark_written(self, rows: list):
+        self.written += len(rows)
+        self.batches += 1
+
+        if self.on_written is None:
+            return
+
+        try:
+            self.on_written(rows)
+        except Exception:
+            logger.exception("on_written failed for %d rows", len(rows))
+
+    async def flush(self, batch: list):
+        """
+        Writes a batch, retrying with backoff. A batch that still fails is split until the bad rows are isolated, so one bad row doesn't lose the others.
+        """
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self.write_batch(batch)
+                self.mark_written(batch)
+                return
+            except Exception as e:
+                error = e
+
+            if attempt < self.max_retries:
+                await asyncio.sleep(self.flush_interval * 2**attempt)
+
+        await self.flush_split(batch, error)
+
+    async def flush_split(self, rows: list, error: Exception):
+        if len(rows) == 1:
+            self.failed += 1
+            logger.error(
+                "Dropped %s row %r: %s", self.model_type.__tablename__, rows[0], error
+            )
+            return
+
+        middle = len(rows) // 2
+        for half in (rows[:middle], rows[middle:]):
+            try:
+                await self.write_batch(half)
+                self.mark_written(half)
+            except Exception as e:
+                await self.flush_split(half, e)
+
+    async def run(self):
+        while True:
+            batch = await self.get_batch()
+
+            try:
+                await self.flush(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def stats(self):
+        return {
+            "queued": self.queue.qsize() if self.queue is not None else 0,
+            "written": self.written,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+
+settings = Settings()
+score_writer = BufferedWriter(
+    GameScore,
+    batch_size=settings.score_batch_size,
+    flush_interval=settings.score_flush_interval,
+    max_queue_size=settings.score_queue_size,
+    put_timeout=settings.score_put_timeout,
+    on_written=leaderboard_service.add_scores,
+)
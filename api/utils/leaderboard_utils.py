@@ -0,0 +1,198 @@
+import logging
+import threading
+
+from sortedcontainers import SortedList
+from sqlalchemy import func, select
+
+logger = logging.getLogger(__name__)
+
+
+class Leaderboard:
+    """
+    Best score per user, kept in score order. Updates, ranks and slices are O(log n).
+    """
+
+    def __init__(self) -> None:
+        self.scores = {}
+        # (-score, user_id): highest score first, ties broken by user id
+        self.entries = SortedList()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add_score(self, user_id: int, score: int) -> bool:
+        """Keeps the score if it beats the user's best. Returns whether it did."""
+
+        best = self.scores.get(user_id)
+        if best is not None and best >= score:
+            return False
+
+        if best is not None:
+            self.entries.remove((-best, user_id))
+
+        self.scores[user_id] = score
+        self.entries.add((-score, user_id))
+        return True
+
+    def remove_user(self, user_id: int):
+        score = self.scores.pop(user_id, None)
+        if score is not None:
+            self.entries.remove((-score, user_id))
+
+    def get_rank(self, user_id: int):
+        """1-based rank of a user, or None if they have no score."""
+
+        score = self.scores.get(user_id)
+        if score is None:
+            return None
+        return self.entries.index((-score, user_id)) + 1
+
+    def get_range(self, start: int, stop: int) -> list:
+        """Entries ranked start + 1 to stop, as dicts with rank, user_id and score."""
+
+        start = max(start, 0)
+        return [
+            {"rank": start + offset + 1, "user_id": user_id, "score": -score}
+            for offset, (score, user_id) in enumerate(
+                self.entries.islice(start, stop)
+            )
+        ]
+
+    def get_top(self, limit: int = 10) -> list:
+        return self.get_range(0, limit)
+
+    def get_neighbors(self, user_id: int, count: int = 5):
+        """The user's entry with up to `count` entries above and below it, or None if they have no score."""
+
+        rank = self.get_rank(user_id)
+        if rank is None:
+            return None
+        return self.get_range(rank - 1 - count, rank + count)
+
+
+class LeaderboardService:
+    """
+    In-memory leaderboards per game and per game type, updated on every stored score and rebuilt from game_scores in the background on startup. Boards are empty until the rebuild finishes.
+
+    The boards live in the process, so the API must run as a single worker: with several uvicorn workers each one only sees the scores it stored itself (plus whatever was in the table when it started) and they serve different rankings. Scaling out needs the boards moved to shared storage, e.g. a Redis sorted set per board.
+    """
+
+    def __init__(self) -> None:
+        self.games = {}
+        self.game_types = {}
+        # game id -> game type, for scores that arrive without one
+        self.game_type_by_game = {}
+        self.lock = threading.Lock()
+        # scores added while a rebuild reads the table, replayed onto the rebuilt boards
+        self.added_during_rebuild = None
+        self.rebuild_thread = None
+
+    def get_game(self, game_id: str) -> Leaderboard:
+        return self.games.get(game_id) or Leaderboard()
+
+    def get_game_type(self, game_type) -> Leaderboard:
+        return self.game_types.get(game_type) or Leaderboard()
+
+    def set_game_type(self, game_id: str, game_type):
+        self.game_type_by_game[game_id] = game_type
+
+    def add_score(self, game_id: str, game_type, user_id: int, score: int):
+        with self.lock:
+            if self.added_during_rebuild is not None:
+                self.added_during_rebuild.append((game_id, game_type, user_id, score))
+
+            self.games.setdefault(game_id, Leaderboard()).add_score(user_id, score)
+            if game_type is not None:
+                self.game_types.setdefault(game_type, Leaderboard()).add_score(
+                    user_id, score
+                )
+
+    def add_scores(self, rows: list):
+        """Adds stored game_scores rows (dicts with game_id, user_id and score)."""
+
+        for row in rows:
+            game_type = self.game_type_by_game.get(row["game_id"])
+            self.add_score(row["game_id"], game_type, row["user_id"], row["score"])
+
+    def clear(self):
+        with self.lock:
+            self.games = {}
+            self.game_types = {}
+
+    def rebuild(self, engine, batch_size: int = 10000):
+        """Reloads every leaderboard with the best score per user and game."""
+
+        from models.game import Game, GameScore
+
+        statement = (
+            select(
+                GameScore.game_id,
+                Game.game_type,
+                GameScore.user_id,
+                func.max(GameScore.score),
+            )
+            .join(Game, Game.id == GameScore.game_id)
+            .group_by(GameScore.game_id, Game.game_type, GameScore.user_id)
+        )
+
+        games = {}
+        game_types = {}
+        game_type_by_game = {}
+
+        with self.lock:
+            self.added_during_rebuild = []
+
+        with engine.connect() as conn:
+            result = conn.execution_options(yield_per=batch_size).execute(statement)
+            for game_id, game_type, user_id, score in result:
+                game_type_by_game[game_id] = game_type
+                games.setdefault(game_id, Leaderboard()).add_score(user_id, score)
+                game_types.setdefault(game_type, Leaderboard()).add_score(
+                    user_id, score
+                )
+
+        # swap in the new boards at once so readers never see a partial rebuild
+        with self.lock:
+            for game_id, game_type, user_id, score in self.added_during_rebuild:
+                games.setdefault(game_id, Leaderboard()).add_score(user_id, score)
+                if game_type is not None:
+                    game_types.setdefault(game_type, Leaderboard()).add_score(
+                        user_id, score
+                    )
+
+            self.added_during_rebuild = None
+            self.games = games
+            self.game_types = game_types
+            self.game_type_by_game.update(game_type_by_game)
+
+    def start_rebuild(self, engine, batch_size: int = 10000):
+        """Rebuilds the boards on a background thread, so startup doesn't wait for the scan of game_scores."""
+
+        if self.rebuild_thread is not None and self.rebuild_thread.is_alive():
+            return self.rebuild_thread
+
+        def run():
+            try:
+                self.rebuild(engine, batch_size)
+            except Exception:
+                with self.lock:
+                    self.added_during_rebuild = None
+                logger.exception("Rebuilding the leaderboards failed")
+
+        self.rebuild_thread = threading.Thread(
+            target=run, name="leaderboard-rebuild", daemon=True
+        )
+        self.rebuild_thread.start()
+        return self.rebuild_thread
+
+    def stats(self):
+        return {
+            "rebuilding": self.rebuild_thread is not None
+            and self.rebuild_thread.is_alive(),
+            "games": len(self.games),
+            "game_types": len(self.game_types),
+            "entries": sum(len(board) for board in self.games.values()),
+        }
+
+
+leaderboard_service = LeaderboardService()
@@ -0,0 +1,247 @@
+import io
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import create_engine, func, select, text
+
+from utils.metadata_utils import get_model_metadata
+from utils.model_utils import iter_dummy_data
+
+
+class LoadResult:
+    """Rows written by a load, its duration and the rows that failed as (row number, error)."""
+
+    def __init__(self, rows: int = 0, seconds: float = 0.0, errors: list = None) -> None:
+        self.rows = rows
+        self.seconds = seconds
+        self.errors = errors or []
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def merge(self, result: "LoadResult"):
+        self.rows += result.rows
+        self.errors.extend(result.errors)
+
+    def __repr__(self):
+        return (
+            f"<LoadResult(rows={self.rows}, seconds={self.seconds:.2f}, "
+            f"rows_per_second={self.rows_per_second:.0f}, errors={len(self.errors)})>"
+        )
+
+
+def get_primary_key(model):
+    """The single primary key column of a model, or None for composite keys."""
+
+    primary_keys = get_model_metadata(model).primary_keys
+    return primary_keys[0] if len(primary_keys) == 1 else None
+
+
+def get_next_id(engine, model):
+    primary_key = get_primary_key(model)
+    if primary_key is None or primary_key.python_type is not int:
+        return 1
+
+    with engine.connect() as conn:
+        return (conn.execute(select(func.max(primary_key.column))).scalar() or 0) + 1
+
+
+def set_primary_key_range(model, columns: dict, first_id: int, size: int):
+    """Numbers integer primary keys from `first_id`. Other keys keep their random values."""
+
+    import numpy as np
+
+    primary_key = get_primary_key(model)
+    if primary_key is None or primary_key.python_type is not int:
+        return columns
+
+    columns[primary_key.key] = np.arange(first_id, first_id + size)
+    return columns
+
+
+# NULL marker of COPY. Other values are quoted and quoted values are never NULL, so "" and a literal \N survive
+copy_null = "\\N"
+
+
+def format_copy_value(value, processor=None):
+    if processor is not None:
+        value = processor(value)
+
+    if value is None:
+        return copy_null
+
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def copy_rows(conn, table, keys: list, rows: list):
+    """
+    Streams rows into a PostgreSQL table with COPY FROM STDIN (psycopg2). Values go through the column types' bind processors, as they would for an INSERT.
+    """
+
+    preparer = conn.dialect.identifier_preparer
+    column_names = ", ".join(preparer.quote(table.c[key].name) for key in keys)
+    processors = [table.c[key].type.bind_processor(conn.dialect) for key in keys]
+
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(",".join(map(format_copy_value, row, processors)) + "\n")
+    buffer.seek(0)
+
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {preparer.format_table(table)} ({column_names}) "
+            f"FROM STDIN WITH (FORMAT csv, NULL '{copy_null}')",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def insert_rows(conn, table, keys: list, rows: list):
+    conn.execute(table.insert(), [dict(zip(keys, row)) for row in rows])
+
+
+def insert_rows_one_by_one(conn, table, keys: list, rows: list, first_row: int):
+    """Inserts a failed chunk row by row, each in a savepoint. Returns the rows written and the errors."""
+
+    written = 0
+    errors = []
+
+    for index, row in enumerate(rows):
+        try:
+            with conn.begin_nested():
+                conn.execute(table.insert(), dict(zip(keys, row)))
+            written += 1
+        except Exception as e:
+            errors.append((first_row + index, str(getattr(e, "orig", e))))
+
+    return written, errors
+
+
+def load_columns(engine, table, columns: dict, first_row: int = 0) -> LoadResult:
+    """
+    Writes a chunk of column arrays to a table in one transaction: COPY on PostgreSQL, executemany elsewhere. When the chunk fails, it is retried row by row so only the bad rows are lost.
+    """
+
+    keys = list(columns)
+    rows = list(zip(*(columns[key].tolist() for key in keys)))
+    write_rows = copy_rows if engine.dialect.name == "postgresql" else insert_rows
+
+    try:
+        with engine.begin() as conn:
+            write_rows(conn, table, keys, rows)
+        return LoadResult(rows=len(rows))
+    except Exception:
+        pass  # find the bad rows below
+
+    with engine.begin() as conn:
+        written, errors = insert_rows_one_by_one(conn, table, keys, rows, first_row)
+    return LoadResult(rows=written, errors=errors)
+
+
+def load_dummy_range(
+    engine,
+    model,
+    first_id: int,
+    length: int,
+    chunk_size: int = 50000,
+    seed: int = None,
+) -> LoadResult:
+    """Generates and writes `length` rows with primary keys starting at `first_id`, one chunk at a time."""
+
+    result = LoadResult()
+    row = 0
+
+    for columns in iter_dummy_data(
+        model, length, chunk_size=chunk_size, seed=seed, as_columns=True
+    ):
+        size = min(chunk_size, length - row)
+        set_primary_key_range(model, columns, first_id + row, size)
+        result.merge(load_columns(engine, model.__table__, columns, first_row=row))
+        row += size
+
+    return result
+
+
+def load_dummy_range_in_worker(url: str, *args) -> LoadResult:
+    engine = create_engine(url)
+    try:
+        return load_dummy_range(engine, *args)
+    finally:
+        engine.dispose()
+
+
+def reset_sequence(engine, table):
+    """Moves the PostgreSQL sequence of a table past the ids written by the loader."""
+
+    # only integer keys generated by the database have a sequence
+    if engine.dialect.name != "postgresql" or table.autoincrement_column is None:
+        return
+
+    column = table.autoincrement_column.name
+    table = table.name
+    statement = text(
+        f"SELECT setval(pg_get_serial_sequence(:table, :column), "
+        f'(SELECT MAX("{column}") FROM "{table}"))'
+    )
+    with engine.begin() as conn:
+        conn.execute(statement, {"table": table, "column": column})
+
+
+def load_dummy_data(
+    engine,
+    model,
+    length: int,
+    chunk_size: int = 50000,
+    workers: int = 1,
+    seed: int = None,
+) -> LoadResult:
+    """
+    Seeds `length` dummy rows of a model. Each worker process generates and writes its own disjoint primary key range. SQLite allows a single writer, so it always loads in this process.
+    """
+
+    start = time.perf_counter()
+
+    first_id = get_next_id(engine, model)
+
+    if engine.dialect.name == "sqlite":
+        workers = 1
+
+    workers = max(1, min(workers, length))
+    result = LoadResult()
+
+    if workers == 1:
+        result.merge(
+            load_dummy_range(engine, model, first_id, length, chunk_size, seed)
+        )
+    else:
+        url = engine.url.render_as_string(hide_password=False)
+        per_worker = -(-length // workers)
+        offsets = range(0, length, per_worker)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    load_dummy_range_in_worker,
+                    url,
+                    model,
+                    first_id + offset,
+                    min(per_worker, length - offset),
+                    chunk_size,
+                    None if seed is None else seed + worker,
+                )
+                for worker, offset in enumerate(offsets)
+            ]
+            for offset, future in zip(offsets, futures):
+                worker_result = future.result()
+                worker_result.errors = [
+                    (offset + row, error) for row, error in worker_result.errors
+                ]
+                result.merge(worker_result)
+
+    reset_sequence(engine, model.__table__)
+
+    result.seconds = time.perf_counter() - start
+    return result
@@ -0,0 +1,174 @@
+import threading
+from inspect import getmembers
+from typing import Any, Optional
+
+from pydantic import BaseModel, Field, create_model
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Enum,
+    Float,
+    Integer,
+    String,
+    event,
+)
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import Mapper, class_mapper
+
+# column type -> type of generated field values, checked in order
+field_types = [
+    (String, str),
+    (Integer, int),
+    (Boolean, bool),
+    (Float, float),
+    (Date, str),  # Date might be converted to string
+    (DateTime, str),  # DateTime might be converted to string
+    (Enum, str),  # Enum is usually mapped to string
+]
+
+
+def get_default_value(column: Column):
+    """
+    Get the default value of a column if specified, otherwise return None.
+    """
+    if column.default is not None and column.default.is_scalar:
+        return column.default.arg
+    if column.nullable:
+        return None
+    return ...
+
+
+def get_field_type(column: Column):
+    for column_type, field_type in field_types:
+        if isinstance(column.type, column_type):
+            return field_type
+
+    # Default to Any if we can't determine the type
+    return Any
+
+
+def get_python_type(column: Column):
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return Any
+
+
+class ColumnMetadata:
+    """Everything the model helpers read from a column, resolved once."""
+
+    def __init__(self, key: str, column: Column) -> None:
+        self.key = key
+        self.name = column.name
+        self.column = column
+        self.type = column.type
+        self.python_type = get_python_type(column)
+        self.field_type = get_field_type(column)
+        self.default = get_default_value(column)
+        self.nullable = column.nullable
+        self.primary_key = column.primary_key
+        # integer primary key generated by the database
+        self.autoincrement = column is column.table.autoincrement_column
+        self.foreign_keys = [fk.target_fullname for fk in column.foreign_keys]
+
+        # columns backing a hybrid property are named "_<property>"
+        self.field_name = key.replace("_", "", 1) if key.startswith("_") else key
+
+
+class ModelMetadata:
+    """
+    Columns, keys and hybrid properties of a mapped class, and the schema generated from its columns. Primary keys and columns with defaults are optional in the schema, and left out of model data when empty so the defaults apply.
+    """
+
+    def __init__(self, model_class: type) -> None:
+        mapper = class_mapper(model_class)
+
+        self.model_class = model_class
+        self.columns = [
+            ColumnMetadata(prop.key, prop.columns[0]) for prop in mapper.column_attrs
+        ]
+        self.columns_by_name = {column.name: column for column in self.columns}
+        self.columns_by_field = {column.field_name: column for column in self.columns}
+
+        self.primary_keys = [column for column in self.columns if column.primary_key]
+        self.foreign_keys = [column for column in self.columns if column.foreign_keys]
+        self.hybrid_properties = [
+            name
+            for name, attr in getmembers(model_class)
+            if isinstance(getattr(attr, "descriptor", None), hybrid_property)
+        ]
+
+        # fields generated for dummy data, primary keys the database generates are left out
+        self.fields = [column for column in self.columns if not column.autoincrement]
+        self.field_names = [column.field_name for column in self.fields]
+        self.field_types = [column.field_type for column in self.fields]
+
+        self.keys = [column.key for column in self.columns]
+        self.key_set = set(self.keys)
+        self.generated_keys = {
+            column.key
+            for column in self.columns
+            if column.primary_key
+            or column.column.default is not None
+            or column.column.server_default is not None
+        }
+        self.schema = self.create_schema()
+
+    def create_schema(self) -> type:
+        schema_fields = {}
+
+        for column in self.columns:
+            python_type = column.python_type
+            default = column.default
+
+            if column.key in self.generated_keys:
+                python_type = Optional[python_type]
+                default = None if default is ... else default
+            elif column.nullable:
+                python_type = Optional[python_type]
+
+            schema_fields[column.key] = (python_type, Field(default=default))
+
+        return create_model(f"TempSchema_{self.model_class.__name__}", **schema_fields)
+
+    def get_column(self, name: str) -> ColumnMetadata:
+        return self.columns_by_name.get(name) or self.columns_by_field.get(name)
+
+    def get_schema(self, model_instance) -> BaseModel:
+        return self.schema(**{key: getattr(model_instance, key) for key in self.keys})
+
+    def get_model_data(self, schema: BaseModel) -> dict:
+        return {
+            key: value
+            for key, value in schema.model_dump().items()
+            if key in self.key_set
+            and not (value is None and key in self.generated_keys)
+        }
+
+
+# mapped class -> ModelMetadata
+model_metadata = {}
+model_metadata_lock = threading.Lock()
+
+
+def get_model_metadata(model_class: type) -> ModelMetadata:
+    if not isinstance(model_class, type):
+        model_class = model_class.__class__
+
+    metadata = model_metadata.get(model_class)
+
+    if metadata is None:
+        with model_metadata_lock:
+            metadata = model_metadata.get(model_class)
+            if metadata is None:
+                metadata = model_metadata[model_class] = ModelMetadata(model_class)
+
+    return metadata
+
+
+@event.listens_for(Mapper, "mapper_configured")
+def clear_model_metadata(mapper, model_class):
+    model_metadata.pop(model_class, None)
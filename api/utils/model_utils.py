@@ -1,4 +1,7 @@
 from sqlalchemy.orm import Session, class_mapper
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from pydantic import BaseModel, Field, create_model
 from typing import Dict, Optional, Union, List
 from sqlalchemy.orm import Session
@@ -15,13 +18,18 @@ from sqlalchemy import (
     Float,
     Integer,
     String,
+    UniqueConstraint,
     inspect,
+    insert,
+    select,
 )
 import random
 import string
 from datetime import date, datetime, timedelta
 from typing import List
 
+# get_default_value lived here before metadata_utils, keep importing it from model_utils working
+from utils.metadata_utils import get_default_value, get_model_metadata
 from utils.func_utils import (
     get_callable_args,
     get_class_fields_and_types,
@@ -34,27 +42,114 @@ from utils.random_utils import (
     random_datetime,
     random_float,
     random_int,
+    get_random_generator,
+    random_string_array,
+    random_bool_array,
+    random_date_array,
+    random_datetime_array,
+    random_float_array,
+    random_int_array,
+    random_key_array,
 )
 
 
+def iter_chunks(items: list, chunk_size: int):
+    for start in range(0, len(items), chunk_size):
+        yield items[start : start + chunk_size]
+
+
+def get_bulk_insert_rows(
+    schemas: List[BaseModel], model_type: type
+) -> List[Dict[str, object]]:
+    """
+    Converts schemas (or models) into insert parameters of the model's columns.
+    """
+
+    metadata = get_model_metadata(model_type)
+
+    rows = []
+    for schema in schemas:
+        if not isinstance(schema, BaseModel):  # this is a model, not a schema
+            schema = convert_model_to_schema(schema)
+
+        rows.append(metadata.get_model_data(schema))
+
+    return rows
+
+
+def get_bulk_insert_statement(model_type: type, dialect):
+    """
+    Multi-row INSERT ... RETURNING of the model. SQLite has no sentinel to sort the returned rows by, and sorting would fall back to one statement per row; it returns multi-row VALUES in insertion order anyway.
+    """
+
+    return insert(model_type).returning(
+        model_type, sort_by_parameter_order=dialect.name != "sqlite"
+    )
+
+
+def bulk_insert_model_to_db(
+    db: Session,
+    schemas: List[BaseModel],
+    model_type: type,
+    chunk_size: int = 1000,
+):
+    """
+    Inserts schemas with one INSERT ... RETURNING per chunk, in a single transaction.
+    Returns the inserted instances with their generated primary keys and defaults loaded, without refreshing them.
+    """
+
+    rows = get_bulk_insert_rows(schemas, model_type)
+    statement = get_bulk_insert_statement(model_type, db.get_bind().dialect)
+
+    instances = []
+
+    try:
+        for chunk in iter_chunks(rows, chunk_size):
+            instances.extend(db.scalars(statement, chunk).all())
+    except Exception:
+        db.rollback()
+        raise
+
+    commit_returned_instances(db)
+
+    return instances
+
+
+def commit_returned_instances(db: Session):
+    # the RETURNING values are current, don't expire them on commit
+    expire_on_commit = db.expire_on_commit
+    db.expire_on_commit = False
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = expire_on_commit
+
+
 def insert_model_to_db(
-    db: Session, schemas: Union[BaseModel, List[BaseModel]], model_type: type
+    db: Session,
+    schemas: Union[BaseModel, List[BaseModel]],
+    model_type: type,
+    bulk: bool = False,
+    chunk_size: int = 1000,
 ):
     """
     Inserts a new record or records into the database based on the provided schema(s) and model type.
+    With `bulk`, a list is inserted set-based in chunks of `chunk_size` rows and the list of instances is returned.
     """
 
     if not isinstance(schemas, list):
         schemas = [schemas]
 
+    if bulk:
+        return bulk_insert_model_to_db(db, schemas, model_type, chunk_size)
+
     instances = []
 
     for schema in schemas:
         if not isinstance(schema, BaseModel):  # this is a model, not a schema
             schema = convert_model_to_schema(schema)
 
-        model_data = schema.model_dump()
-        model_instance = model_type(**model_data)
+        model_instance = convert_schema_to_model(schema, model_type)
         db.add(model_instance)
         instances.append(model_instance)
         db.commit()
@@ -92,8 +187,7 @@ def upsert_model_to_db(
                 setattr(instance, key, value)
     else:
         # Create new instance
-        model_data = schema.model_dump()
-        instance = model_type(**model_data)
+        instance = convert_schema_to_model(schema, model_type)
         db.add(instance)
 
     db.commit()
@@ -102,15 +196,174 @@ def upsert_model_to_db(
     return instance
 
 
+def get_upsert_insert(dialect):
+    """Returns the insert construct with ON CONFLICT support of a dialect, or None."""
+
+    if dialect.name == "postgresql":
+        return postgresql_insert
+    if dialect.name == "sqlite":
+        return sqlite_insert
+    return None
+
+
+def get_conflict_keys(model_type: type) -> List[str]:
+    """
+    Columns identifying a row for upserts: the model's unique constraint (or unique index) if it has exactly one, else its primary key. Models with several unique constraints must pass `conflict_keys` explicitly.
+    """
+
+    table = model_type.__table__
+
+    unique_constraints = [
+        constraint
+        for constraint in table.constraints
+        if isinstance(constraint, UniqueConstraint)
+    ] + [index for index in table.indexes if index.unique]
+
+    if len(unique_constraints) > 1:
+        raise ValueError(
+            f"{model_type.__name__} has {len(unique_constraints)} unique constraints, pass conflict_keys explicitly"
+        )
+
+    if unique_constraints:
+        return [column.key for column in unique_constraints[0].columns]
+
+    return [column.key for column in table.primary_key.columns]
+
+
+def get_conflict_condition(schema, model_type: type, conflict_keys: List[str]):
+    if not isinstance(schema, BaseModel):
+        schema = convert_model_to_schema(schema)
+
+    data = schema.model_dump()
+    return tuple(getattr(model_type, key) == data.get(key) for key in conflict_keys)
+
+
+def dedupe_upsert_rows(rows: List[dict], conflict_keys: List[str]) -> List[dict]:
+    """
+    Keeps the last row per conflict key, as sequential upserts would. PostgreSQL rejects a statement that updates the same row twice.
+    """
+
+    rows_by_key = {}
+    rows_without_key = []  # primary keys generated by the database
+
+    for row in rows:
+        key = tuple(row.get(k) for k in conflict_keys)
+        if None in key:
+            rows_without_key.append(row)
+        else:
+            rows_by_key[key] = row
+
+    return list(rows_by_key.values()) + rows_without_key
+
+
+def get_bulk_upsert_statement(
+    model_type: type,
+    dialect,
+    conflict_keys: List[str],
+    update_keys: List[str],
+):
+    statement = get_upsert_insert(dialect)(model_type)
+
+    if update_keys:
+        statement = statement.on_conflict_do_update(
+            index_elements=conflict_keys,
+            set_={key: statement.excluded[key] for key in update_keys},
+        )
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=conflict_keys)
+
+    return statement.returning(model_type)
+
+
+def get_upsert_update_keys(
+    rows: List[dict],
+    model_type: type,
+    conflict_keys: List[str],
+    excluded_keys: List[str],
+) -> List[str]:
+    """
+    Columns set on conflict. A column with a default is only updated when every row sets it: rows that leave it out get the default on insert, which must not overwrite the stored value. Insert-only columns such as creation times belong in `excluded_keys`.
+    """
+
+    generated_keys = get_model_metadata(model_type).generated_keys
+    all_keys = set(rows[0]) if rows else set()
+    any_keys = set()
+
+    for row in rows:
+        all_keys &= row.keys()
+        any_keys |= row.keys()
+
+    update_keys = {
+        key for key in any_keys if key in all_keys or key not in generated_keys
+    }
+    return sorted(update_keys - set(conflict_keys) - set(excluded_keys))
+
+
+def prepare_bulk_upsert(
+    schemas: List[BaseModel],
+    model_type: type,
+    dialect,
+    excluded_keys: List[str],
+    conflict_keys: List[str] = None,
+):
+    """Returns the deduplicated rows and the upsert statement shared by every chunk."""
+
+    conflict_keys = conflict_keys or get_conflict_keys(model_type)
+    rows = dedupe_upsert_rows(get_bulk_insert_rows(schemas, model_type), conflict_keys)
+    update_keys = get_upsert_update_keys(rows, model_type, conflict_keys, excluded_keys)
+
+    statement = get_bulk_upsert_statement(
+        model_type, dialect, conflict_keys, update_keys
+    )
+    return rows, statement
+
+
+def bulk_upsert_models_to_db(
+    db: Session,
+    schemas: List[BaseModel],
+    model_type: type,
+    excluded_keys: List[str] = ["id", "created_at"],
+    conflict_keys: List[str] = None,
+    chunk_size: int = 1000,
+):
+    """
+    Upserts schemas with one INSERT ... ON CONFLICT DO UPDATE per chunk, in a single transaction. Only PostgreSQL and SQLite are supported.
+    Returns the inserted and updated instances in RETURNING order.
+    """
+
+    rows, statement = prepare_bulk_upsert(
+        schemas, model_type, db.get_bind().dialect, excluded_keys, conflict_keys
+    )
+
+    instances = []
+
+    try:
+        for chunk in iter_chunks(rows, chunk_size):
+            result = db.scalars(
+                statement, chunk, execution_options={"populate_existing": True}
+            )
+            instances.extend(result.all())
+    except Exception:
+        db.rollback()
+        raise
+
+    commit_returned_instances(db)
+
+    return instances
+
+
 def upsert_models_to_db(
     db: Session,
     schemas: Union[BaseModel, List[BaseModel]],
     model_type: type,
     conditions: Optional[Union[dict, List[dict]]] = None,
-    excluded_keys: List[str] = ["id"],
+    excluded_keys: List[str] = ["id", "created_at"],
+    conflict_keys: List[str] = None,
+    chunk_size: int = 1000,
 ) -> Union[BaseModel, List[BaseModel]]:
     """
-    Inserts new records or updates existing records in the database for multiple schemas using the upsert_model_to_db function.
+    Inserts new records or updates existing records in the database for multiple schemas.
+    Without `conditions`, PostgreSQL and SQLite upsert set-based on `conflict_keys` (by default the model's only unique constraint, else its primary key; see get_conflict_keys). Explicit conditions and other dialects fall back to upsert_model_to_db per row.
     """
 
     if not isinstance(schemas, list):
@@ -119,10 +372,23 @@ def upsert_models_to_db(
     if conditions and not isinstance(conditions, list):
         conditions = [conditions]
 
+    if not conditions and get_upsert_insert(db.get_bind().dialect) is not None:
+        updated_instances = bulk_upsert_models_to_db(
+            db, schemas, model_type, excluded_keys, conflict_keys, chunk_size
+        )
+        return (
+            updated_instances if len(updated_instances) > 1 else updated_instances[0]
+        )
+
+    conflict_keys = conflict_keys or get_conflict_keys(model_type)
     updated_instances = []
 
     for idx, schema in enumerate(schemas):
-        condition = conditions[idx] if idx < len(conditions) else None
+        condition = (
+            conditions[idx]
+            if conditions and idx < len(conditions)
+            else get_conflict_condition(schema, model_type, conflict_keys)
+        )
 
         instance = upsert_model_to_db(
             db=db,
@@ -136,6 +402,197 @@ def upsert_models_to_db(
     return updated_instances if len(updated_instances) > 1 else updated_instances[0]
 
 
+async def async_bulk_insert_model_to_db(
+    db: AsyncSession,
+    schemas: List[BaseModel],
+    model_type: type,
+    chunk_size: int = 1000,
+):
+    """
+    Async variant of bulk_insert_model_to_db.
+    """
+
+    rows = get_bulk_insert_rows(schemas, model_type)
+    statement = get_bulk_insert_statement(model_type, db.get_bind().dialect)
+
+    instances = []
+
+    try:
+        for chunk in iter_chunks(rows, chunk_size):
+            instances.extend((await db.scalars(statement, chunk)).all())
+    except Exception:
+        await db.rollback()
+        raise
+
+    await async_commit_returned_instances(db)
+
+    return instances
+
+
+async def async_commit_returned_instances(db: AsyncSession):
+    sync_session = db.sync_session
+    expire_on_commit = sync_session.expire_on_commit
+    sync_session.expire_on_commit = False
+    try:
+        await db.commit()
+    finally:
+        sync_session.expire_on_commit = expire_on_commit
+
+
+async def async_insert_model_to_db(
+    db: AsyncSession,
+    schemas: Union[BaseModel, List[BaseModel]],
+    model_type: type,
+    bulk: bool = False,
+    chunk_size: int = 1000,
+):
+    """
+    Async variant of insert_model_to_db.
+    """
+
+    if not isinstance(schemas, list):
+        schemas = [schemas]
+
+    if bulk:
+        return await async_bulk_insert_model_to_db(db, schemas, model_type, chunk_size)
+
+    instances = []
+
+    for schema in schemas:
+        if not isinstance(schema, BaseModel):  # this is a model, not a schema
+            schema = convert_model_to_schema(schema)
+
+        model_instance = convert_schema_to_model(schema, model_type)
+        db.add(model_instance)
+        instances.append(model_instance)
+
+    await db.commit()
+
+    for instance in instances:
+        await db.refresh(instance)
+
+    return instances if len(instances) > 1 else instances[0]
+
+
+async def async_upsert_model_to_db(
+    db: AsyncSession,
+    schema: BaseModel,
+    model_type: type,
+    condition: tuple,
+    excluded_keys=["id"],
+) -> BaseModel:
+    """
+    Async variant of upsert_model_to_db.
+    """
+
+    statement = (
+        select(model_type).filter(*condition)
+        if isinstance(condition, tuple)
+        else select(model_type).filter(condition)
+    )
+    instance = (await db.execute(statement)).scalars().first()
+
+    if not isinstance(schema, BaseModel):
+        schema = convert_model_to_schema(schema)
+
+    if instance:
+        # Update existing instance
+        for key, value in schema.model_dump().items():
+            if key not in excluded_keys:
+                setattr(instance, key, value)
+    else:
+        # Create new instance
+        instance = convert_schema_to_model(schema, model_type)
+        db.add(instance)
+
+    await db.commit()
+    await db.refresh(instance)
+
+    return instance
+
+
+async def async_bulk_upsert_models_to_db(
+    db: AsyncSession,
+    schemas: List[BaseModel],
+    model_type: type,
+    excluded_keys: List[str] = ["id", "created_at"],
+    conflict_keys: List[str] = None,
+    chunk_size: int = 1000,
+):
+    """
+    Async variant of bulk_upsert_models_to_db.
+    """
+
+    rows, statement = prepare_bulk_upsert(
+        schemas, model_type, db.get_bind().dialect, excluded_keys, conflict_keys
+    )
+
+    instances = []
+
+    try:
+        for chunk in iter_chunks(rows, chunk_size):
+            result = await db.scalars(
+                statement, chunk, execution_options={"populate_existing": True}
+            )
+            instances.extend(result.all())
+    except Exception:
+        await db.rollback()
+        raise
+
+    await async_commit_returned_instances(db)
+
+    return instances
+
+
+async def async_upsert_models_to_db(
+    db: AsyncSession,
+    schemas: Union[BaseModel, List[BaseModel]],
+    model_type: type,
+    conditions: Optional[Union[dict, List[dict]]] = None,
+    excluded_keys: List[str] = ["id", "created_at"],
+    conflict_keys: List[str] = None,
+    chunk_size: int = 1000,
+) -> Union[BaseModel, List[BaseModel]]:
+    """
+    Async variant of upsert_models_to_db.
+    """
+
+    if not isinstance(schemas, list):
+        schemas = [schemas]
+
+    if conditions and not isinstance(conditions, list):
+        conditions = [conditions]
+
+    if not conditions and get_upsert_insert(db.get_bind().dialect) is not None:
+        updated_instances = await async_bulk_upsert_models_to_db(
+            db, schemas, model_type, excluded_keys, conflict_keys, chunk_size
+        )
+        return (
+            updated_instances if len(updated_instances) > 1 else updated_instances[0]
+        )
+
+    conflict_keys = conflict_keys or get_conflict_keys(model_type)
+    updated_instances = []
+
+    for idx, schema in enumerate(schemas):
+        condition = (
+            conditions[idx]
+            if conditions and idx < len(conditions)
+            else get_conflict_condition(schema, model_type, conflict_keys)
+        )
+
+        instance = await async_upsert_model_to_db(
+            db=db,
+            schema=schema,
+            model_type=model_type,
+            condition=condition,
+            excluded_keys=excluded_keys,
+        )
+        updated_instances.append(instance)
+
+    return updated_instances if len(updated_instances) > 1 else updated_instances[0]
+
+
 def get_multiple_filter_conditions(
     model, schemas: List[BaseModel], attribute: str, operator: str = "=="
 ) -> List[Dict[str, Union[str, int]]]:
@@ -169,13 +626,10 @@ def get_multiple_filter_conditions(
 
 def is_column_of_type(model, column_name, column_type):
     """
-    Checks if a given column in the model is of ARRAY type.
+    Checks if a given column in the model is of the given column type.
     """
-    mapper = inspect(model)
-    for column in mapper.columns:
-        if column.name == column_name:
-            return isinstance(column.type, column_type)
-    return False
+    column = get_model_metadata(model).columns_by_name.get(column_name)
+    return column is not None and isinstance(column.type, column_type)
 
 
 def parse_array_string(array_str: str):
@@ -216,62 +670,57 @@ def convert_sqlalchemy_column_to_default(column: Column):
             return None
 
 
+def random_list(random_value):
+    return lambda: [random_value() for _ in range(random_int(1, 5))]
+
+
+# field type -> random value generator
+field_value_generators = {
+    str: random_string,
+    int: random_int,
+    float: random_float,
+    bool: random_bool,
+    datetime: random_datetime,
+    date: random_date,
+    List[str]: random_list(random_string),
+    List[int]: random_list(random_int),
+    List[float]: random_list(random_float),
+    List[bool]: random_list(random_bool),
+    List[datetime]: random_list(random_datetime),
+}
+
+
 def get_field_value(target_schema_or_model, field, field_type: type):
-    value = None
-    if field_type == str:
-        value = random_string()
-    elif field_type == int:
-        value = random_int()
-    elif field_type == float:
-        value = random_float()
-    elif field_type == bool:
-        value = random_bool()
-    elif field_type == datetime:
-        value = random_datetime()
-    elif field_type == date:
-        value = random_date()
-    elif field_type == List[str]:
-        value = [random_string() for _ in range(random_int(1, 5))]
-    elif field_type == List[int]:
-        value = [random_int() for _ in range(random_int(1, 5))]
-    elif field_type == List[float]:
-        value = [random_float() for _ in range(random_int(1, 5))]
-    elif field_type == List[bool]:
-        value = [random_bool() for _ in range(random_int(1, 5))]
-    elif field_type == List[datetime]:
-        value = [random_datetime() for _ in range(random_int(1, 5))]
-    else:
-        if hasattr(target_schema_or_model, "__fields__"):
-            fields = target_schema_or_model.__fields__
-            val = fields.get(field)
-            val: FieldInfo
-            value = val.default  # default to FieldInfo default for unsupported types
-        else:
-            model_columns = [c for c in class_mapper(target_schema_or_model).columns]
+    generator = field_value_generators.get(field_type)
+    if generator is not None:
+        return generator()
+
+    if hasattr(target_schema_or_model, "__fields__"):
+        fields = target_schema_or_model.__fields__
+        val = fields.get(field)
+        val: FieldInfo
+        return val.default  # default to FieldInfo default for unsupported types
 
-            for column in model_columns:
-                field_name = column.name
-                default_value = convert_sqlalchemy_column_to_default(column)
-                value = default_value
-    return value
+    column = get_model_metadata(target_schema_or_model).get_column(field)
+    return convert_sqlalchemy_column_to_default(column.column) if column else None
 
 
 def generate_dummy_data(target_schema_or_model: type, length: int = 1):
     if length <= 0:
         length = 1
 
+    # resolved once, each row only generates values
+    fields = list(zip(*get_class_fields_and_types(target_schema_or_model)))
+    required_args = get_required_args(target_schema_or_model.__init__)
+
     def generate_dummy_instance():
         dummy_instance = {}
 
-        fields, field_types = get_class_fields_and_types(target_schema_or_model)
-
-        for field, field_type in zip(fields, field_types):
+        for field, field_type in fields:
             dummy_instance[field] = get_field_value(
                 target_schema_or_model, field, field_type
             )
 
-        required_args = get_required_args(target_schema_or_model.__init__)
-
         data = target_schema_or_model(**required_args)
 
         for k, v in dummy_instance.items():
@@ -284,45 +733,88 @@ def generate_dummy_data(target_schema_or_model: type, length: int = 1):
         return generate_dummy_instance()
 
 
-def get_default_value(column: Column):
+# python type -> vectorized random value generator
+column_array_generators = {
+    str: random_string_array,
+    int: random_int_array,
+    float: random_float_array,
+    bool: random_bool_array,
+    datetime: random_datetime_array,
+    date: random_date_array,
+}
+
+
+def generate_dummy_columns(target_model: type, size: int, rng) -> dict:
     """
-    Get the default value of a column if specified, otherwise return None.
+    Generates `size` values for every dummy data field of a model, one NumPy array per column key. Primary keys the database doesn't generate get random keys.
     """
-    if column.default is not None and column.default.is_scalar:
-        return column.default.arg
-    if column.nullable:
-        return None
-    return ...
+
+    import numpy as np
+
+    columns = {}
+
+    for column in get_model_metadata(target_model).fields:
+        generator = column_array_generators.get(column.python_type)
+
+        if column.primary_key and generator is random_string_array:
+            length = min(getattr(column.type, "length", None) or 32, 32)
+            columns[column.key] = random_key_array(rng, size, length)
+        elif column.primary_key and generator is random_int_array:
+            columns[column.key] = random_int_array(rng, size, 1, 2**62)
+        elif generator is random_string_array:
+            length = min(getattr(column.type, "length", None) or 10, 10)
+            columns[column.key] = generator(rng, size, length)
+        elif generator is not None:
+            columns[column.key] = generator(rng, size)
+        else:
+            values = np.empty(size, dtype=object)
+            values.fill(convert_sqlalchemy_column_to_default(column.column))
+            columns[column.key] = values
+
+    return columns
+
+
+def iter_dummy_data(
+    target_model: type,
+    length: int,
+    chunk_size: int = 10000,
+    seed: int = None,
+    as_columns: bool = False,
+):
+    """
+    Yields dummy data for a model in chunks of `chunk_size` rows, as lists of row dicts or, with `as_columns`, dicts of column arrays.
+    Only one chunk is held in memory. The same seed and chunk size produce the same data.
+    """
+
+    rng = get_random_generator(seed)
+
+    for start in range(0, length, chunk_size):
+        columns = generate_dummy_columns(target_model, min(chunk_size, length - start), rng)
+
+        if as_columns:
+            yield columns
+            continue
+
+        keys = list(columns)
+        values = [columns[key].tolist() for key in keys]
+        yield [dict(zip(keys, row)) for row in zip(*values)]
 
 
 def convert_model_to_schema(model_instance):
     if isinstance(model_instance, BaseModel):
         return model_instance
 
-    model_class = model_instance.__class__
-    model_fields = {
-        column.name: (
-            (
-                Optional[column.type.python_type]
-                if column.nullable
-                else column.type.python_type
-            ),
-            Field(default=get_default_value(column)),
-        )
-        for column in class_mapper(model_class).columns
-    }
-    TempSchema = create_model(f"TempSchema_{model_class.__name__}", **model_fields)
-
-    instance_data = {
-        column.name: getattr(model_instance, column.name)
-        for column in class_mapper(model_class).columns
-    }
-    return TempSchema(**instance_data)
+    return get_model_metadata(model_instance.__class__).get_schema(model_instance)
 
 
 def convert_schema_to_model(schema, target_model_type):
+    """
+    Creates a model instance from the schema fields that are mapped columns of the model.
+    """
+
     if isinstance(schema, BaseModel):
-        return target_model_type(**schema.model_dump())
+        model_data = get_model_metadata(target_model_type).get_model_data(schema)
+        return target_model_type(**model_data)
 
     raise TypeError("schema is not an instance of BaseModel.")
 
@@ -364,13 +856,8 @@ def get_model_sequence_id(
     if sequence_id is None:
         sequence_id = "id"
 
-    id_column = next(
-        (
-            c
-            for c in class_mapper(target_schema_or_model).columns
-            if c.name == sequence_id
-        ),
-        None,
+    id_column = get_model_metadata(target_schema_or_model).columns_by_name.get(
+        sequence_id
     )
 
     return id_column.name
@@ -3,16 +3,22 @@ import string
 from typing import Optional
 from jose import JWTError, jwt
 import datetime
+import hashlib
 import os
+import uuid
 
 from models.user import User
 from fastapi import Depends, Request, status, HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from api.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from api.database import get_async_db
 from api.config import Settings
 
-from api.schemas import TokenData
+from api.schemas import RoleSnapshot, TokenData, UserSnapshot
+from utils.cache_utils import LRUCache
+from utils.revocation_utils import RevocationList, create_revocation_store
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
@@ -22,22 +28,56 @@ SECRET_KEY = settings.secret_key
 ALGORITHM = settings.algorithm
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
 
+# token hash -> (TokenData, UserSnapshot)
+principal_cache = LRUCache(
+    maxsize=settings.principal_cache_size, ttl=settings.principal_cache_ttl
+)
 
-def create_access_token(data: dict):
+# user id -> role_version
+role_version_cache = LRUCache(
+    maxsize=settings.principal_cache_size, ttl=settings.role_version_ttl
+)
+
+
+revocation_list = RevocationList(
+    create_revocation_store(
+        settings.revocation_backend, settings.revocation_sqlite_path
+    ),
+    refresh_interval=settings.revocation_refresh_interval,
+    capacity=settings.revocation_capacity,
+    error_rate=settings.revocation_error_rate,
+)
+
+
+def get_token_key(token: str):
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def create_access_token(data: dict, user: User = None):
     to_encode = data.copy()
 
+    # role claims let role checks skip loading the user
+    if user is not None:
+        to_encode.update(
+            {
+                "username": user.username,
+                "roles": [role.name for role in user.roles],
+                "role_version": user.role_version or 0,
+            }
+        )
+
     expire = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
         minutes=ACCESS_TOKEN_EXPIRE_MINUTES
     )
 
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
 
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
     return encoded_jwt
 
 
-def invalidate_access_token(token: str):
+async def invalidate_access_token(token: str):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("user_id")
@@ -47,8 +87,14 @@ def invalidate_access_token(token: str):
         print("EXCEPTION:", e)
         raise HTTPException(status_code=401, detail="Invalid token")
 
+    jti = payload.get("jti")
+    if jti:
+        await revocation_list.revoke(jti, payload.get("exp"))
+
+    principal_cache.pop(get_token_key(token))
 
-def verify_access_token(token: str, raise_exception: bool = True):
+
+async def verify_access_token(token: str, raise_exception: bool = True):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail=f"Could not validate credentials",
@@ -67,21 +113,110 @@ def verify_access_token(token: str, raise_exception: bool = True):
 
         if isinstance(id, int):
             id = str(id)
-        token_data = TokenData(id=id)
+        token_data = TokenData(
+            id=id,
+            exp=payload.get("exp"),
+            jti=payload.get("jti"),
+            username=payload.get("username"),
+            roles=payload.get("roles") or [],
+            role_version=payload.get("role_version"),
+        )
     except JWTError:
         raise credentials_exception
 
+    if token_data.jti and await revocation_list.is_revoked(token_data.jti):
+        raise credentials_exception
+
     return token_data
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+def get_credentials_exception():
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=f"Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def get_cached_principal(token_key: str):
+    """Returns the cached (TokenData, UserSnapshot) pair of a token, if it is still valid."""
+
+    principal = principal_cache.get(token_key)
+
+    if principal is not None:
+        token_data = principal[0]
+
+        if token_data.jti and await revocation_list.is_revoked(token_data.jti):
+            principal_cache.pop(token_key)
+            raise get_credentials_exception()
+
+    return principal
+
+
+async def load_user_snapshot(db: AsyncSession, user_id: str):
+    statement = (
+        select(User).options(selectinload(User.roles)).filter(User.id == int(user_id))
+    )
+    user = (await db.execute(statement)).scalars().first()
+
+    if user is None:
+        return None
+
+    role_version_cache.set(str(user.id), user.role_version or 0)
+    return UserSnapshot.model_validate(user)
+
+
+async def get_existing_role_version(db: AsyncSession, token_key: str, user_id: str):
+    """The user's role_version. Evicts the token's principal and raises 401 once the user is gone."""
+
+    role_version = await get_role_version(db, user_id)
+
+    if role_version is None:
+        principal_cache.pop(token_key)
+        raise get_credentials_exception()
+
+    return role_version
+
+
+async def has_current_roles(
+    db: AsyncSession, token_key: str, user_snapshot: UserSnapshot
 ):
+    if user_snapshot.role_version is None:
+        return False
+
+    return user_snapshot.role_version >= await get_existing_role_version(
+        db, token_key, str(user_snapshot.id)
+    )
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> UserSnapshot:
+    """
+    Returns a read-only snapshot of the authenticated user. Verified tokens are cached until they expire, so repeated requests skip the decode and the SELECT.
+    A cached snapshot is reloaded once the user's role_version moves past it. Versions are cached per worker for ROLE_VERSION_TTL seconds, so a role change made through another worker is picked up within that time.
+    """
+
+    token_key = get_token_key(token)
+    principal = await get_cached_principal(token_key)
+
+    if principal is not None and await has_current_roles(db, token_key, principal[1]):
+        return principal[1]
 
-    token = verify_access_token(token, True)
-    user = db.query(User).filter(User.id == token.id).first()
+    token_data = (
+        principal[0] if principal else await verify_access_token(token, True)
+    )
+    user_snapshot = await load_user_snapshot(db, token_data.id)
+
+    if user_snapshot is None:
+        principal_cache.pop(token_key)
+        raise get_credentials_exception()
+
+    principal_cache.set(
+        token_key, (token_data, user_snapshot), expires_at=token_data.exp
+    )
 
-    return user
+    return user_snapshot
 
 
 def extract_token_from_request(request: Request):
@@ -98,20 +233,107 @@ def get_token_optional(request: Request) -> Optional[str]:
     return None
 
 
-def get_optional_user(
-    token: Optional[str] = Depends(get_token_optional), db: Session = Depends(get_db)
-) -> Optional[User]:
+async def get_optional_user(
+    token: Optional[str] = Depends(get_token_optional),
+    db: AsyncSession = Depends(get_async_db),
+) -> Optional[UserSnapshot]:
     if token is None:
         return None
 
     try:
-        return get_current_user(token, db)
+        return await get_current_user(token, db)
     except HTTPException:
         return None
 
 
+async def get_role_version(db: AsyncSession, user_id: str):
+    """The user's role_version, or None if the user doesn't exist."""
+
+    role_version = role_version_cache.get(user_id)
+
+    if role_version is None:
+        statement = select(User.role_version).filter(User.id == int(user_id))
+        role_version = (await db.execute(statement)).scalar()
+
+        if role_version is None:
+            return None
+
+        role_version_cache.set(user_id, role_version)
+
+    return role_version
+
+
+async def bump_role_version(db: AsyncSession, user: User):
+    """Marks the roles of a user as changed, so tokens issued before this point fall back to the database."""
+
+    user.role_version = (user.role_version or 0) + 1
+    await db.commit()
+
+    role_version_cache.set(str(user.id), user.role_version)
+    return user.role_version
+
+
+def forget_user(user_id):
+    """
+    Drops the cached role_version of a deleted user, so cached principals of their tokens are rejected on their next use in this worker. Other workers notice within ROLE_VERSION_TTL.
+    """
+
+    role_version_cache.pop(str(user_id))
+
+
+async def has_current_role_claims(
+    db: AsyncSession, token_key: str, token_data: TokenData
+):
+    if token_data.role_version is None:
+        return False
+
+    return token_data.role_version >= await get_existing_role_version(
+        db, token_key, token_data.id
+    )
+
+
 def get_current_user_with_roles(required_roles: list[str] = ["admin"]):
-    def role_checker(current_user: User = Depends(get_current_user)):
+    async def role_checker(
+        token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+    ) -> UserSnapshot:
+        token_key = get_token_key(token)
+        principal = await get_cached_principal(token_key)
+        token_data = (
+            principal[0] if principal else await verify_access_token(token, True)
+        )
+
+        if await has_current_role_claims(db, token_key, token_data):
+            current_user = (
+                principal[1]
+                if principal
+                else UserSnapshot(
+                    id=token_data.id,
+                    username=token_data.username,
+                    roles=tuple(RoleSnapshot(name=name) for name in token_data.roles),
+                    role_version=token_data.role_version,
+                )
+            )
+            principal_cache.set(
+                token_key, (token_data, current_user), expires_at=token_data.exp
+            )
+        else:
+            # roles changed after the token was issued
+            current_user = await load_user_snapshot(db, token_data.id)
+
+            if current_user is None:
+                principal_cache.pop(token_key)
+                raise get_credentials_exception()
+
+            token_data = token_data.model_copy(
+                update={
+                    "roles": [role.name for role in current_user.roles],
+                    "role_version": current_user.role_version,
+                }
+            )
+            principal_cache.set(
+                token_key, (token_data, current_user), expires_at=token_data.exp
+            )
+
         user_roles = [role.name for role in current_user.roles]
         if not any(role in user_roles for role in required_roles):
             raise HTTPException(status_code=403, detail="Not enough permissions")
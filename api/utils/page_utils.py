@@ -0,0 +1,170 @@
+import base64
+import json
+from typing import List
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from api.config import Settings
+from utils.cache_utils import LRUCache
+
+settings = Settings()
+
+# (statement, parameters) -> row count
+count_cache = LRUCache(maxsize=settings.count_cache_size, ttl=settings.count_cache_ttl)
+
+
+def encode_cursor(values: list) -> str:
+    data = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(data)
+    except ValueError:
+        values = None
+
+    if not isinstance(values, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+    return values
+
+
+def get_page_query(query, order_by: List, cursor: str = None, limit: int = 50):
+    """
+    Orders the query by `order_by` (unique together, ascending) and continues after the row the cursor was taken from. Fetches one extra row to know whether there is a next page.
+    """
+
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(order_by):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+
+        if len(order_by) == 1:
+            query = query.filter(order_by[0] > values[0])
+        else:
+            query = query.filter(tuple_(*order_by) > tuple_(*values))
+
+    return query.order_by(*order_by).limit(limit + 1)
+
+
+def get_page(items: list, order_by: List, limit: int, total: int = None) -> dict:
+    next_cursor = None
+
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in order_by])
+
+    return {"items": items, "next_cursor": next_cursor, "total": total}
+
+
+def get_count_key(query):
+    compiled = query.compile()
+    return str(compiled), tuple(sorted(compiled.params.items(), key=str))
+
+
+def get_count_statement(query):
+    return select(func.count()).select_from(query.order_by(None).subquery())
+
+
+def get_reltuples_statement(query):
+    """
+    Planner estimate of the table's rows on PostgreSQL, for unfiltered queries on one table.
+    """
+
+    tables = query.get_final_froms()
+    if query.whereclause is not None or len(tables) != 1:
+        return None
+
+    return text(
+        "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"
+    ).bindparams(table=tables[0].name)
+
+
+def get_total(db: Session, query):
+    """
+    Approximate row count of a query: the planner estimate for whole PostgreSQL tables, otherwise a COUNT(*) cached for `count_cache_ttl` seconds.
+    """
+
+    if db.get_bind(clause=query).dialect.name == "postgresql":
+        statement = get_reltuples_statement(query)
+        if statement is not None:
+            total = db.execute(statement).scalar()
+            # -1 until the table has been vacuumed or analyzed
+            if total is not None and total >= 0:
+                return total
+
+    key = get_count_key(query)
+    total = count_cache.get(key)
+
+    if total is None:
+        total = db.execute(get_count_statement(query)).scalar()
+        count_cache.set(key, total)
+
+    return total
+
+
+async def async_get_total(db: AsyncSession, query):
+    """
+    Async variant of get_total.
+    """
+
+    if db.get_bind(clause=query).dialect.name == "postgresql":
+        statement = get_reltuples_statement(query)
+        if statement is not None:
+            total = (await db.execute(statement)).scalar()
+            if total is not None and total >= 0:
+                return total
+
+    key = get_count_key(query)
+    total = count_cache.get(key)
+
+    if total is None:
+        total = (await db.execute(get_count_statement(query))).scalar()
+        count_cache.set(key, total)
+
+    return total
+
+
+def paginate(
+    db: Session,
+    query,
+    order_by: List,
+    cursor: str = None,
+    limit: int = 50,
+    with_total: bool = False,
+) -> dict:
+    """
+    Returns one page of a select as {"items", "next_cursor", "total"}. Pass `next_cursor` back as `cursor` for the next page; it is None on the last page.
+    """
+
+    items = db.execute(get_page_query(query, order_by, cursor, limit)).scalars().all()
+    total = get_total(db, query) if with_total else None
+    return get_page(items, order_by, limit, total)
+
+
+async def async_paginate(
+    db: AsyncSession,
+    query,
+    order_by: List,
+    cursor: str = None,
+    limit: int = 50,
+    with_total: bool = False,
+) -> dict:
+    """
+    Async variant of paginate.
+    """
+
+    result = await db.execute(get_page_query(query, order_by, cursor, limit))
+    items = result.scalars().all()
+    total = await async_get_total(db, query) if with_total else None
+    return get_page(items, order_by, limit, total)
@@ -15,8 +15,6 @@ from utils.date_utils import parse_date
 from utils.str_utils import str_to_bool
 from inspect import signature
 
-from utils.url_utils import is_valid_url
-
 
 def parse_args_to_dict(args):
     args_dict = {}
@@ -132,6 +130,9 @@ class DirectoryArgument(Argument):
 
 
 def is_valid_url_type(url: str):
+    # url_utils pulls in requests, only load it for url arguments
+    from utils.url_utils import is_valid_url
+
     if is_valid_url(url):
         return url
 
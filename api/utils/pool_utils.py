@@ -0,0 +1,131 @@
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """Counters collected from connection pool events."""
+
+    def __init__(self) -> None:
+        self.pool = None
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.closes = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def increment(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get_pool_value(self, name: str):
+        # NullPool and StaticPool don't track connections
+        method = getattr(self.pool, name, None)
+        return method() if method else None
+
+    def snapshot(self) -> dict:
+        return {
+            "size": self.get_pool_value("size"),
+            "checked_out": self.get_pool_value("checkedout"),
+            "checked_in": self.get_pool_value("checkedin"),
+            "overflow": self.get_pool_value("overflow"),
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "connects": self.connects,
+            "closes": self.closes,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "wait_avg_ms": (
+                self.wait_total / self.wait_count * 1000 if self.wait_count else 0.0
+            ),
+            "wait_max_ms": self.wait_max * 1000,
+        }
+
+
+class InstrumentedPoolMixin:
+    """Times how long each checkout waits for a connection."""
+
+    metrics: PoolMetrics = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        timed_out = False
+
+        try:
+            return super()._do_get()
+        except TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.record_wait(time.perf_counter() - start, timed_out)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        if self.metrics is not None:
+            self.metrics.pool = pool
+        return pool
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def get_pool_arguments(settings) -> dict:
+    """Returns create_engine pool arguments from settings."""
+
+    return {
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_timeout": settings.database_pool_timeout,
+        "pool_recycle": settings.database_pool_recycle,
+        "pool_pre_ping": settings.database_pool_pre_ping,
+        "pool_use_lifo": settings.database_pool_use_lifo,
+    }
+
+
+def attach_pool_metrics(engine, metrics: PoolMetrics = None):
+    """Registers pool event listeners on an engine (or the sync engine of an async engine)."""
+
+    engine = getattr(engine, "sync_engine", engine)
+
+    if metrics is None:
+        metrics = PoolMetrics()
+
+    metrics.pool = engine.pool
+    if isinstance(engine.pool, InstrumentedPoolMixin):
+        engine.pool.metrics = metrics
+
+    event.listen(engine, "connect", lambda *args: metrics.increment("connects"))
+    event.listen(engine, "close", lambda *args: metrics.increment("closes"))
+    event.listen(engine, "checkout", lambda *args: metrics.increment("checkouts"))
+    event.listen(engine, "checkin", lambda *args: metrics.increment("checkins"))
+    event.listen(
+        engine, "invalidate", lambda *args: metrics.increment("invalidations")
+    )
+
+    return metrics
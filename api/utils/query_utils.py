@@ -0,0 +1,120 @@
+import re
+import time
+import warnings
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+
+class RepeatedQueryWarning(UserWarning):
+    """The same statement ran more often than allowed in one request (usually an N+1 lazy load)."""
+
+
+class QueryStats:
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.duration += seconds
+        self.fingerprints[get_statement_fingerprint(statement)] += 1
+
+    def get_repeated_statements(self, threshold: int) -> dict:
+        return {
+            statement: count
+            for statement, count in self.fingerprints.items()
+            if count > threshold
+        }
+
+    def get_server_timing(self):
+        return f'db;dur={self.duration * 1000:.2f};desc="{self.count} queries"'
+
+
+# stats of the request being served
+request_query_stats: ContextVar[QueryStats] = ContextVar(
+    "request_query_stats", default=None
+)
+
+# stats collected by assert_max_queries, across threads and requests
+active_query_budgets = []
+
+
+def get_statement_fingerprint(statement: str):
+    """Normalizes a statement so executions that differ only in literals or IN-list length match."""
+
+    statement = re.sub(r"'(?:[^']|'')*'", "?", statement)
+    statement = re.sub(r"\b\d+\b", "?", statement)
+    statement = re.sub(r"\(\s*(?:[?%$:][\w()]*\s*,\s*)+[?%$:][\w()]*\s*\)", "(?)", statement)
+    return re.sub(r"\s+", " ", statement).strip()
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info["query_start_time"].pop()
+
+    stats = request_query_stats.get()
+    if stats is not None:
+        stats.record(statement, seconds)
+
+    for budget in active_query_budgets:
+        budget.record(statement, seconds)
+
+
+def handle_error(context):
+    # failed statements never reach after_cursor_execute, drop their start time
+    conn = context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+
+def instrument_engine(engine):
+    """Records every statement of an engine (or the sync engine of an async engine)."""
+
+    engine = getattr(engine, "sync_engine", engine)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine, "handle_error", handle_error)
+
+    return engine
+
+
+def warn_repeated_statements(stats: QueryStats, threshold: int, path: str = None):
+    for statement, count in stats.get_repeated_statements(threshold).items():
+        warnings.warn(
+            f"{path}: statement ran {count} times: {statement}",
+            RepeatedQueryWarning,
+        )
+
+
+@contextmanager
+def assert_max_queries(max_queries: int, max_repeats: int = None):
+    """
+    Pytest helper that fails when the block issues more than `max_queries` statements, or repeats one statement more than `max_repeats` times.
+
+        with assert_max_queries(3):
+            client.get("/users/", headers=headers)
+    """
+
+    stats = QueryStats()
+    active_query_budgets.append(stats)
+
+    try:
+        yield stats
+    finally:
+        active_query_budgets.remove(stats)
+
+    assert (
+        stats.count <= max_queries
+    ), f"expected at most {max_queries} queries, got {stats.count}: {dict(stats.fingerprints)}"
+
+    if max_repeats is not None:
+        repeated = stats.get_repeated_statements(max_repeats)
+        assert not repeated, f"statements repeated more than {max_repeats} times: {repeated}"
@@ -1,25 +1,3 @@
-import sqlite3
-from sqlalchemy.orm import Session, class_mapper
-from pydantic import BaseModel, Field, create_model
-from typing import Dict, Optional, Union, List
-from sqlalchemy.orm import Session, DeclarativeMeta
-from pydantic import BaseModel
-from pydantic.fields import FieldInfo
-import os
-from sqlalchemy import Operators
-
-
-from sqlalchemy import (
-    ARRAY,
-    Boolean,
-    Column,
-    Date,
-    DateTime,
-    Float,
-    Integer,
-    String,
-    inspect,
-)
 import random
 import string
 from datetime import date, datetime, timedelta
@@ -50,3 +28,149 @@ def random_date(start_date=date(1970, 1, 1), end_date=date.today()):
     delta = end_date - start_date
     random_days = random.randint(0, delta.days)
     return start_date + timedelta(days=random_days)
+
+
+# Vectorized generators. Each returns a NumPy array of `size` values drawn from
+# `rng`, a numpy.random.Generator, with the same ranges as the functions above.
+
+string_alphabet = (string.ascii_letters + string.digits).encode()
+
+
+def get_random_generator(seed=None):
+    import numpy as np
+
+    return np.random.default_rng(seed)
+
+
+def random_string_array(rng, size: int, length=10, lengths=None):
+    """`lengths` optionally shortens each string, up to `length` characters."""
+
+    import numpy as np
+
+    alphabet = np.frombuffer(string_alphabet, dtype=np.uint8)
+    indexes = rng.integers(0, len(alphabet), size=(size, length), dtype=np.uint8)
+    chars = alphabet[indexes]
+
+    if lengths is not None:
+        # trailing NUL bytes are dropped by the fixed-width string dtype
+        chars[np.arange(length) >= np.asarray(lengths)[:, None]] = 0
+
+    return chars.view(f"S{length}").ravel().astype(f"U{length}")
+
+
+def random_key_array(rng, size: int, length=32):
+    """Random lowercase hex keys (uuid4().hex when `length` is 32), for string primary keys."""
+
+    import numpy as np
+
+    hex_digits = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+    nibbles = rng.integers(0, 16, size=(size, length), dtype=np.uint8)
+    return hex_digits[nibbles].view(f"S{length}").ravel().astype(f"U{length}")
+
+
+def random_int_array(rng, size: int, min_val=0, max_val=10):
+    return rng.integers(min_val, max_val, size=size, endpoint=True)
+
+
+def random_float_array(rng, size: int, min_val=0.0, max_val=10.0):
+    return rng.uniform(min_val, max_val, size=size)
+
+
+def random_bool_array(rng, size: int):
+    return rng.integers(0, 2, size=size).astype(bool)
+
+
+def random_date_array(rng, size: int, start_date=date(1970, 1, 1), end_date=None):
+    import numpy as np
+
+    end_date = end_date or date.today()
+    offsets = rng.integers(0, (end_date - start_date).days, size=size, endpoint=True)
+    return np.datetime64(start_date, "D") + offsets
+
+
+def random_datetime_array(
+    rng, size: int, start_date=datetime(2000, 1, 1), end_date=datetime(2024, 7, 4)
+):
+    import numpy as np
+
+    offsets = rng.integers(0, (end_date - start_date).days, size=size, endpoint=True)
+    return (np.datetime64(start_date, "D") + offsets).astype("datetime64[us]")
+
+
+class AliasTable:
+    """
+    Walker/Vose alias table over `len(weights)` outcomes: O(n) to build, then each draw is one uniform index and one coin flip, whatever the weights.
+    """
+
+    def __init__(self, weights) -> None:
+        import numpy as np
+
+        weights = np.asarray(weights, dtype=np.float64)
+        size = len(weights)
+
+        if size == 0 or weights.min() < 0 or not weights.sum() > 0:
+            raise ValueError("Weights must be non-negative with a positive sum")
+
+        self.weights = weights
+        scaled = (weights * (size / weights.sum())).tolist()
+        probabilities = [1.0] * size
+        alias = list(range(size))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            less = small.pop()
+            more = large[-1]
+
+            probabilities[less] = scaled[less]
+            alias[less] = more
+
+            # the large outcome gives away what fills the small one's column
+            scaled[more] += scaled[less] - 1.0
+            if scaled[more] < 1.0:
+                small.append(large.pop())
+
+        # leftovers are 1.0 up to rounding
+        self.probabilities = np.array(probabilities)
+        self.alias = np.array(alias, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.alias)
+
+    def sample(self, rng, size: int):
+        """`size` outcome indexes drawn with replacement."""
+
+        import numpy as np
+
+        columns = rng.integers(0, len(self.alias), size=size)
+        coins = rng.random(size)
+        return np.where(coins < self.probabilities[columns], columns, self.alias[columns])
+
+    def sample_unique(self, rng, size: int, max_rounds: int = 8):
+        """
+        `size` distinct outcome indexes, drawn without replacement. Repeats are dropped from batches of alias draws; when that stalls (`size` close to the number of outcomes, or most weight on a few of them) it falls back to an O(n) weighted draw.
+        """
+
+        import numpy as np
+
+        if size > np.count_nonzero(self.weights):
+            raise ValueError("Sample larger than the outcomes with non-zero weight")
+
+        drawn = np.empty(0, dtype=np.int64)
+
+        for _ in range(max_rounds):
+            batch = np.concatenate([drawn, self.sample(rng, 2 * (size - len(drawn)))])
+            _, first = np.unique(batch, return_index=True)
+            # first occurrences in draw order are a draw without replacement
+            drawn = batch[np.sort(first)]
+
+            if len(drawn) >= size:
+                return drawn[:size]
+
+        return rng.choice(
+            len(self.weights),
+            size=size,
+            replace=False,
+            p=self.weights / self.weights.sum(),
+        )
@@ -0,0 +1,267 @@
+import datetime
+import heapq
+import math
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.config import Settings
+from models.review import ReviewState
+from utils.cache_utils import LRUCache
+from utils.model_utils import get_upsert_insert
+from utils.revocation_utils import utc_now
+
+min_ease = 1.3
+
+
+def schedule_review(
+    ease: float,
+    interval: int,
+    repetitions: int,
+    quality: int,
+    now: datetime.datetime,
+):
+    """
+    SM-2: the next (ease, interval in days, repetitions, due_at) after answering with a quality of 0 (blackout) to 5 (perfect).
+    """
+
+    if quality < 3:
+        # start over, the word is shown again tomorrow
+        repetitions = 0
+        interval = 1
+    else:
+        if repetitions == 0:
+            interval = 1
+        elif repetitions == 1:
+            interval = 6
+        else:
+            interval = round(interval * ease)
+        repetitions += 1
+
+    ease = max(min_ease, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    due_at = now + datetime.timedelta(days=interval)
+
+    return ease, interval, repetitions, due_at
+
+
+class DueQueue:
+    """
+    Min-heap of a user's (due_at, word_id), holding every review state ordered up to the `loaded_until` (due_at, word_id) key. Rescheduled words get a new entry and stale ones are skipped when popped.
+    """
+
+    def __init__(self, loaded_until: tuple) -> None:
+        self.loaded_until = loaded_until
+        self.due = {}
+        self.heap = []
+
+    def __len__(self):
+        return len(self.due)
+
+    def push(self, word_id: int, due_at: datetime.datetime):
+        if (due_at, word_id) > self.loaded_until:
+            # later words are loaded from the table once the queue gets there
+            self.due.pop(word_id, None)
+            return
+
+        self.due[word_id] = due_at
+        heapq.heappush(self.heap, (due_at, word_id))
+
+    def remove(self, word_id: int):
+        self.due.pop(word_id, None)
+
+    def _discard_stale(self):
+        heap = self.heap
+        while heap and self.due.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def get_due(self, now: datetime.datetime, limit: int = 20) -> list:
+        """Up to `limit` (word_id, due_at) due at `now`, soonest first. O(limit log n)."""
+
+        popped = []
+        self._discard_stale()
+
+        while self.heap and len(popped) < limit and self.heap[0][0] <= now:
+            popped.append(heapq.heappop(self.heap))
+            self._discard_stale()
+
+        for entry in popped:
+            heapq.heappush(self.heap, entry)
+
+        return [(word_id, due_at) for due_at, word_id in popped]
+
+
+class ReviewScheduler:
+    """
+    Schedules word reviews with SM-2 and keeps a DueQueue per active user, so the next due words are read from memory instead of the user's whole review history.
+    Queues are per process, so words read from a queue are checked against the table before they are served: a review stored by another worker only costs a reload of the affected entries.
+    """
+
+    def __init__(
+        self,
+        cache_size: int = 10000,
+        cache_ttl: float = 600,
+        queue_size: int = 1000,
+        queue_horizon: float = 86400,
+    ) -> None:
+        self.queue_size = queue_size
+        self.queue_horizon = datetime.timedelta(seconds=queue_horizon)
+        self.queues = LRUCache(maxsize=cache_size, ttl=cache_ttl)
+
+    async def load_queue(
+        self, db: AsyncSession, user_id: int, now: datetime.datetime, size: int = None
+    ):
+        """Loads the user's next `size` (default `queue_size`) review states due within the horizon, off the (user_id, due_at) index."""
+
+        size = size or self.queue_size
+        horizon = now + self.queue_horizon
+        result = await db.execute(
+            select(ReviewState.word_id, ReviewState.due_at)
+            .filter(ReviewState.user_id == user_id, ReviewState.due_at <= horizon)
+            .order_by(ReviewState.due_at, ReviewState.word_id)
+            .limit(size)
+        )
+        rows = result.all()
+
+        if len(rows) == size:
+            # ties on due_at are split by word id, so no row past the last one is skipped
+            loaded_until = (rows[-1][1], rows[-1][0])
+        else:
+            loaded_until = (horizon, math.inf)
+
+        queue = DueQueue(loaded_until)
+        for word_id, due_at in rows:
+            queue.push(word_id, due_at)
+
+        self.queues.set(user_id, queue)
+        return queue
+
+    async def get_stored_due(self, db: AsyncSession, user_id: int, word_ids: list):
+        result = await db.execute(
+            select(ReviewState.word_id, ReviewState.due_at).filter(
+                ReviewState.user_id == user_id, ReviewState.word_id.in_(word_ids)
+            )
+        )
+        return dict(result.all())
+
+    async def get_due(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        limit: int = 20,
+        now: datetime.datetime = None,
+        max_rounds: int = 3,
+    ) -> list:
+        """The user's next `limit` due words as (word_id, due_at), soonest first."""
+
+        now = now or utc_now()
+        queue = self.queues.get(user_id)
+
+        for _ in range(max_rounds):
+            if queue is None:
+                queue = await self.load_queue(db, user_id, now, max(self.queue_size, limit))
+
+            due = queue.get_due(now, limit)
+
+            if len(due) < limit and queue.loaded_until[0] <= now:
+                # words past the loaded range may be due by now
+                queue = None
+                continue
+
+            if not due:
+                return due
+
+            # entries rescheduled by another worker are corrected and the words drawn again
+            stored = await self.get_stored_due(db, user_id, [word_id for word_id, _ in due])
+            stale = [
+                word_id for word_id, due_at in due if stored.get(word_id) != due_at
+            ]
+            if not stale:
+                return due
+
+            for word_id in stale:
+                if word_id in stored:
+                    queue.push(word_id, stored[word_id])
+                else:
+                    queue.remove(word_id)
+
+        # fall back to the table when the queue keeps changing underneath
+        queue = await self.load_queue(db, user_id, now, max(self.queue_size, limit))
+        return queue.get_due(now, limit)
+
+    async def review(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        word_id: int,
+        quality: int,
+        now: datetime.datetime = None,
+    ) -> ReviewState:
+        """
+        Records an answer and reschedules the word. The first review of a word creates its state with INSERT ... ON CONFLICT DO NOTHING, so concurrent first reviews don't collide, and the row is locked while it is updated.
+        """
+
+        now = now or utc_now()
+
+        upsert_insert = get_upsert_insert(db.get_bind().dialect)
+        if upsert_insert is not None:
+            await db.execute(
+                upsert_insert(ReviewState)
+                .values(
+                    user_id=user_id,
+                    word_id=word_id,
+                    ease=2.5,
+                    interval=0,
+                    repetitions=0,
+                    due_at=now,
+                )
+                .on_conflict_do_nothing(index_elements=["user_id", "word_id"])
+            )
+
+        result = await db.execute(
+            select(ReviewState)
+            .filter(ReviewState.user_id == user_id, ReviewState.word_id == word_id)
+            .with_for_update()
+        )
+        review_state = result.scalars().first()
+
+        if review_state is None:
+            review_state = ReviewState(
+                user_id=user_id, word_id=word_id, ease=2.5, interval=0, repetitions=0
+            )
+            db.add(review_state)
+
+        (
+            review_state.ease,
+            review_state.interval,
+            review_state.repetitions,
+            review_state.due_at,
+        ) = schedule_review(
+            review_state.ease,
+            review_state.interval,
+            review_state.repetitions,
+            quality,
+            now,
+        )
+        review_state.reviewed_at = now
+
+        await db.commit()
+        await db.refresh(review_state)
+
+        # reschedule in this worker's queue, other workers correct theirs in get_due
+        queue = self.queues.get(user_id)
+        if queue is not None:
+            queue.push(word_id, review_state.due_at)
+
+        return review_state
+
+    def stats(self):
+        return self.queues.stats()
+
+
+settings = Settings()
+review_scheduler = ReviewScheduler(
+    cache_size=settings.review_cache_size,
+    cache_ttl=settings.review_cache_ttl,
+    queue_size=settings.review_queue_size,
+    queue_horizon=settings.review_queue_horizon,
+)
@@ -0,0 +1,250 @@
+import datetime
+import logging
+import math
+import threading
+import time
+
+from sqlalchemy import create_engine, delete, select
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from models.revoked_token import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+
+def to_datetime(timestamp: float):
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).replace(
+        tzinfo=None
+    )
+
+
+def utc_now():
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings. Filters are only ever built in-process, so probes can use the builtin `hash`; the bit array is sized for `hash_count` probes at the requested error rate.
+    """
+
+    def __init__(
+        self, capacity: int = 100000, error_rate: float = 0.001, hash_count: int = 2
+    ) -> None:
+        capacity = max(capacity, 1)
+        self.hash_count = hash_count
+        self.size = math.ceil(
+            -hash_count * capacity / math.log(1 - error_rate ** (1 / hash_count))
+        )
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _indexes(self, key: str):
+        h = hash(key)
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hash_count)]
+
+    def add(self, key: str):
+        bits = self.bits
+        for index in self._indexes(key):
+            bits[index >> 3] |= 1 << (index & 7)
+
+    def __contains__(self, key: str):
+        bits = self.bits
+        h = hash(key)
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        size = self.size
+
+        for i in range(self.hash_count):
+            index = (h1 + i * h2) % size
+            if not bits[index >> 3] & (1 << (index & 7)):
+                return False
+        return True
+
+
+class MemoryRevocationStore:
+    """In-process store of revoked jtis. Only suitable for a single worker."""
+
+    def __init__(self) -> None:
+        self._revoked = {}
+        self._lock = threading.Lock()
+
+    def create_table(self):
+        pass
+
+    def add(self, jti: str, expires_at: float):
+        with self._lock:
+            self._revoked[jti] = expires_at
+
+    def contains(self, jti: str):
+        expires_at = self._revoked.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def purge(self):
+        now = time.time()
+        with self._lock:
+            expired = [jti for jti, exp in self._revoked.items() if exp <= now]
+            for jti in expired:
+                del self._revoked[jti]
+
+    def active(self):
+        now = time.time()
+        with self._lock:
+            return [jti for jti, exp in self._revoked.items() if exp > now]
+
+
+class SQLRevocationStore:
+    """Revoked jtis stored in the revoked_tokens table. Supports SQLite and PostgreSQL."""
+
+    def __init__(self, engine) -> None:
+        self.engine = engine
+
+    def create_table(self):
+        RevokedToken.__table__.create(self.engine, checkfirst=True)
+
+    def _insert(self):
+        if self.engine.dialect.name == "postgresql":
+            return postgresql_insert(RevokedToken)
+        if self.engine.dialect.name == "sqlite":
+            return sqlite_insert(RevokedToken)
+        raise ValueError(f"Unsupported dialect: {self.engine.dialect.name}")
+
+    def add(self, jti: str, expires_at: float):
+        statement = self._insert().values(jti=jti, expires_at=to_datetime(expires_at))
+        statement = statement.on_conflict_do_nothing(index_elements=["jti"])
+
+        with self.engine.begin() as conn:
+            conn.execute(statement)
+
+    def contains(self, jti: str):
+        statement = select(RevokedToken.jti).where(
+            RevokedToken.jti == jti, RevokedToken.expires_at > utc_now()
+        )
+
+        with self.engine.connect() as conn:
+            return conn.execute(statement).first() is not None
+
+    def purge(self):
+        with self.engine.begin() as conn:
+            conn.execute(delete(RevokedToken).where(RevokedToken.expires_at <= utc_now()))
+
+    def active(self):
+        statement = select(RevokedToken.jti).where(RevokedToken.expires_at > utc_now())
+
+        with self.engine.connect() as conn:
+            return conn.execute(statement).scalars().all()
+
+
+class RevocationList:
+    """
+    Bloom filter in front of a revocation store. Tokens that miss the filter are accepted without touching the store; a background thread rebuilds the filter from the store every `refresh_interval` seconds to pick up revocations made by other workers, so requests never wait for the reload.
+    """
+
+    def __init__(
+        self,
+        store,
+        refresh_interval: float = 30,
+        capacity: int = 100000,
+        error_rate: float = 0.001,
+    ) -> None:
+        self.store = store
+        self.refresh_interval = refresh_interval
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+        self.bloom_filter = BloomFilter(capacity, error_rate)
+        self._refresh_lock = threading.Lock()
+        # jtis revoked by this worker while a refresh reads the store
+        self._revoked_during_refresh = None
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Creates the store's table, loads the filter and starts the refresh thread."""
+
+        if self._thread is not None:
+            return
+
+        self.store.create_table()
+        self.refresh()
+
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self.run, name="revocation-refresh", daemon=True
+        )
+        self._thread.start()
+
+    def shutdown(self):
+        if self._thread is None:
+            return
+
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+
+    def run(self):
+        while not self._stopped.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception:
+                # keep serving the current filter, the next round tries again
+                logger.exception("Refreshing the revocation list failed")
+
+    async def revoke(self, jti: str, expires_at: float):
+        if expires_at <= time.time():
+            return
+
+        # stores may block on the database, keep them off the event loop
+        await run_in_threadpool(self.store.add, jti, expires_at)
+        self.bloom_filter.add(jti)
+
+        revoked_during_refresh = self._revoked_during_refresh
+        if revoked_during_refresh is not None:
+            revoked_during_refresh.append(jti)
+
+    async def is_revoked(self, jti: str):
+        if jti not in self.bloom_filter:
+            return False
+
+        return await run_in_threadpool(self.store.contains, jti)
+
+    def refresh(self):
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+
+        try:
+            self._revoked_during_refresh = []
+            self.store.purge()
+            jtis = self.store.active()
+
+            bloom_filter = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate)
+            for jti in jtis:
+                bloom_filter.add(jti)
+
+            # adding twice is harmless and covers revocations made during the swap
+            for jti in self._revoked_during_refresh:
+                bloom_filter.add(jti)
+            self.bloom_filter = bloom_filter
+            for jti in self._revoked_during_refresh:
+                bloom_filter.add(jti)
+        finally:
+            self._revoked_during_refresh = None
+            self._refresh_lock.release()
+
+
+def create_revocation_store(backend: str = "memory", sqlite_path: str = None):
+    if backend == "memory":
+        return MemoryRevocationStore()
+
+    if backend == "sqlite":
+        return SQLRevocationStore(create_engine(f"sqlite:///{sqlite_path}"))
+
+    if backend == "postgres":
+        from api.database import engine
+
+        return SQLRevocationStore(engine)
+
+    raise ValueError(f"Invalid revocation backend: {backend}")
@@ -0,0 +1,89 @@
+import itertools
+
+from sqlalchemy import Select, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+
+def get_async_url(url: str):
+    """Returns the async driver URL of a sync database URL."""
+
+    url = make_url(url)
+
+    if url.get_backend_name() == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+
+    return url.set(drivername=f"{url.get_backend_name()}+asyncpg")
+
+
+def get_checked_out(engine):
+    checkedout = getattr(engine.pool, "checkedout", None)
+    return checkedout() if checkedout else 0
+
+
+class ReplicaRouter:
+    """Holds the primary engine and picks a replica engine for read-only work."""
+
+    def __init__(self, primary, replicas: list = None, strategy: str = "round_robin"):
+        if strategy not in ["round_robin", "least_connections"]:
+            raise ValueError(f"Invalid replica strategy: {strategy}")
+
+        self.primary = primary
+        self.replicas = list(replicas or [])
+        self.strategy = strategy
+        self._counter = itertools.count()
+
+    def get_replica(self):
+        if not self.replicas:
+            return self.primary
+
+        if self.strategy == "least_connections":
+            return min(self.replicas, key=get_checked_out)
+
+        return self.replicas[next(self._counter) % len(self.replicas)]
+
+
+class RoutingSession(Session):
+    """
+    Session that sends SELECTs to a replica. Writes go to the primary, and once a session has written it stays on the primary for the rest of its life, so a refresh after commit reads its own writes. Set `info["use_primary"]` to read a previous request's writes.
+    """
+
+    def __init__(self, router: ReplicaRouter = None, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.router = router
+        self.replica = None
+        self.wrote = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.router is None:
+            return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+        if self.wrote or self.info.get("use_primary") or not isinstance(clause, Select):
+            self.wrote = True
+            return self.router.primary
+
+        # one replica per transaction, so reads see a single snapshot
+        if self.replica is None:
+            self.replica = self.router.get_replica()
+
+        return self.replica
+
+
+@event.listens_for(RoutingSession, "before_flush")
+def route_flush_to_primary(session: RoutingSession, flush_context, instances):
+    # SELECTs issued while flushing (e.g. fetching server defaults) must see the new rows
+    session.wrote = True
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def reset_replica(session: RoutingSession, transaction):
+    # the next transaction may read from another replica, writers stay on the primary
+    if transaction.parent is None:
+        session.replica = None
+
+
+def use_primary(db):
+    """Routes every statement of a session (sync or async) to the primary."""
+
+    db.info["use_primary"] = True
+    return db
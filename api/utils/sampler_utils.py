@@ -0,0 +1,105 @@
+import threading
+
+from api.config import Settings
+from utils.cache_utils import LRUCache
+from utils.random_utils import AliasTable, get_random_generator
+from utils.word_index_utils import WordIndex, word_index_store
+
+
+def get_rank_weights(start: int, stop: int, exponent: float = 1.0):
+    """Zipf weights of ranks start + 1 to stop: a word's frequency falls off as 1 / rank^exponent."""
+
+    import numpy as np
+
+    return 1.0 / np.arange(start + 1, stop + 1, dtype=np.float64) ** exponent
+
+
+class WordSampler:
+    """Frequency-weighted draws from a band of ranks of a word index."""
+
+    def __init__(
+        self, index: WordIndex, start: int, stop: int, exponent: float = 1.0
+    ) -> None:
+        self.index = index
+        self.version = index.version
+        self.start = start
+        self.stop = stop
+        self.table = AliasTable(get_rank_weights(start, stop, exponent))
+
+    def __len__(self):
+        return len(self.table)
+
+    def sample_positions(self, size: int, replace: bool = True, seed: int = None):
+        """Index positions (rank - 1) of `size` draws. The same seed gives the same draws for the same index."""
+
+        rng = get_random_generator(seed)
+
+        if replace:
+            positions = self.table.sample(rng, size)
+        else:
+            positions = self.table.sample_unique(rng, size)
+
+        return self.start + positions
+
+    def sample(self, size: int, replace: bool = True, seed: int = None):
+        """Word ids of `size` draws."""
+
+        return self.index.ids[self.sample_positions(size, replace, seed)]
+
+
+class SamplerService:
+    """
+    Caches a WordSampler per (language, rank band, exponent). A sampler is rebuilt once the language's word index file has been rewritten.
+    """
+
+    def __init__(self, cache_size: int = 256, exponent: float = 1.0) -> None:
+        self.exponent = exponent
+        self.samplers = LRUCache(maxsize=cache_size)
+        self.lock = threading.Lock()
+
+    def get(self, language_id: str, start: int = 0, stop: int = 100) -> WordSampler:
+        """The sampler of ranks start + 1 to stop (clipped to the index), or None without an index or words."""
+
+        index = word_index_store.get(language_id)
+        if index is None:
+            return None
+
+        stop = min(stop, len(index))
+        if start >= stop:
+            return None
+
+        key = (language_id, start, stop, self.exponent)
+        sampler = self.samplers.get(key)
+
+        if sampler is None or sampler.version != index.version:
+            with self.lock:
+                sampler = self.samplers.get(key)
+                if sampler is None or sampler.version != index.version:
+                    sampler = WordSampler(index, start, stop, self.exponent)
+                    self.samplers.set(key, sampler)
+
+        return sampler
+
+    def sample(
+        self,
+        language_id: str,
+        size: int,
+        start: int = 0,
+        stop: int = 100,
+        replace: bool = True,
+        seed: int = None,
+    ):
+        sampler = self.get(language_id, start, stop)
+        if sampler is None:
+            return None
+        return sampler.sample(size, replace, seed)
+
+    def stats(self):
+        return self.samplers.stats()
+
+
+settings = Settings()
+sampler_service = SamplerService(
+    cache_size=settings.sampler_cache_size,
+    exponent=settings.sampler_exponent,
+)
@@ -0,0 +1,123 @@
+import datetime
+import hashlib
+
+from sqlalchemy import delete, insert, inspect, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.schema import CreateColumn, CreateIndex, CreateTable
+
+# loads every model (see models/__init__.py), so the fingerprint always covers the full schema
+from models.schema_version import SchemaVersion
+
+
+class SchemaMigrationRequired(Exception):
+    pass
+
+
+def get_schema_fingerprint(metadata, dialect):
+    """Hashes the DDL the dialect would emit for every table and index of the metadata."""
+
+    digest = hashlib.sha256()
+
+    for table in metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+
+    return digest.hexdigest()
+
+
+def get_stored_fingerprint(engine, name: str = "default"):
+    statement = select(SchemaVersion.fingerprint).where(SchemaVersion.name == name)
+
+    try:
+        with engine.connect() as conn:
+            return conn.execute(statement).scalar()
+    except DBAPIError:
+        # the schema_versions table doesn't exist yet
+        return None
+
+
+def store_fingerprint(engine, fingerprint: str, name: str = "default"):
+    with engine.begin() as conn:
+        conn.execute(delete(SchemaVersion).where(SchemaVersion.name == name))
+        conn.execute(
+            insert(SchemaVersion).values(
+                name=name,
+                fingerprint=fingerprint,
+                updated_at=datetime.datetime.now(datetime.timezone.utc).replace(
+                    tzinfo=None
+                ),
+            )
+        )
+
+
+def get_schema_changes(engine, metadata):
+    """
+    Columns and indexes of the metadata missing from tables that already exist, as ("column" | "index", table, column or index) tuples. create_all only creates whole tables, so these are what it leaves behind. Changed or dropped columns aren't detected.
+    """
+
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    changes = []
+
+    for table in metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+
+        existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing_columns:
+                changes.append(("column", table, column))
+
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            if index.name not in existing_indexes:
+                changes.append(("index", table, index))
+
+    return changes
+
+
+def apply_schema_changes(engine, changes: list):
+    """Adds the missing columns and indexes found by get_schema_changes, in one transaction."""
+
+    preparer = engine.dialect.identifier_preparer
+
+    with engine.begin() as conn:
+        for kind, table, item in changes:
+            if kind == "column":
+                column = CreateColumn(item).compile(dialect=engine.dialect)
+                conn.execute(
+                    text(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {column}")
+                )
+            else:
+                item.create(conn)
+
+
+def format_schema_changes(changes: list):
+    return ", ".join(f"{kind} {table.name}.{item.name}" for kind, table, item in changes)
+
+
+def ensure_schema(engine, metadata, name: str = "default", migrate: bool = False):
+    """
+    Creates missing tables only when the metadata changed since the last run. A matching fingerprint costs a single primary key lookup instead of a reflection pass over every table.
+    Columns and indexes missing from existing tables are added when `migrate` is set, otherwise SchemaMigrationRequired is raised and the fingerprint is not stored, so the check runs again on the next start.
+    Returns True when DDL was run.
+    """
+
+    fingerprint = get_schema_fingerprint(metadata, engine.dialect)
+    if get_stored_fingerprint(engine, name) == fingerprint:
+        return False
+
+    metadata.create_all(engine)
+
+    changes = get_schema_changes(engine, metadata)
+    if changes and not migrate:
+        raise SchemaMigrationRequired(
+            f"Schema out of date ({format_schema_changes(changes)}), "
+            "run scripts/migrate_db.py"
+        )
+    if changes:
+        apply_schema_changes(engine, changes)
+
+    store_fingerprint(engine, fingerprint, name)
+    return True
@@ -0,0 +1,114 @@
+import re
+
+from sqlalchemy.sql.elements import quoted_name
+
+
+def iter_sql_statements(lines):
+    """
+    Splits an SQL script into statements while it is being read. Semicolons inside strings, quoted identifiers, dollar-quoted bodies and comments are ignored.
+    """
+
+    statement = []
+    quote = None  # ', " or a $tag$ delimiter
+    in_block_comment = False
+
+    for line in lines:
+        line = line.rstrip("\n")
+        i = 0
+        length = len(line)
+
+        while i < length:
+            char = line[i]
+
+            if in_block_comment:
+                if line.startswith("*/", i):
+                    in_block_comment = False
+                    i += 2
+                else:
+                    i += 1
+                continue
+
+            if quote:
+                if line.startswith(quote, i):
+                    statement.append(quote)
+                    i += len(quote)
+                    quote = None
+                else:
+                    statement.append(char)
+                    i += 1
+                continue
+
+            if line.startswith("--", i):
+                break
+
+            if line.startswith("/*", i):
+                in_block_comment = True
+                i += 2
+                continue
+
+            if char in ("'", '"'):
+                quote = char
+            elif char == "$":
+                match = re.match(r"\$\w*\$", line[i:])
+                if match:
+                    quote = match.group(0)
+                    statement.append(quote)
+                    i += len(quote)
+                    continue
+            elif char == ";":
+                sql = "".join(statement).strip()
+                if sql:
+                    yield sql
+                statement = []
+                i += 1
+                continue
+
+            statement.append(char)
+            i += 1
+
+        statement.append("\n")
+
+    sql = "".join(statement).strip()
+    if sql:
+        yield sql
+
+
+identifier_pattern = re.compile(r"^[A-Za-z_][A-Za-z0-9_$]*$")
+
+
+def validate_identifier(name: str, value) -> str:
+    value = str(value)
+    if not identifier_pattern.match(value):
+        raise ValueError(f"Invalid identifier for {{{name}}}: {value!r}")
+    return value
+
+
+def substitute_placeholders(statement: str, args: dict, dialect) -> str:
+    """
+    Replaces `{name}` placeholders with validated identifiers. Bare placeholders are quoted by the dialect as identifiers; quoted placeholders ('{name}') become string literals, e.g. for pg_get_serial_sequence.
+    Nothing is bound as a parameter: servers that bind on their side (asyncpg, psycopg 3) reject parameters inside DO blocks and utility statements.
+    """
+
+    args = args or {}
+
+    # escape colons so text() doesn't read them as bind parameters
+    statement = re.sub(r"(?<![:\w\\]):(?=\w)", r"\\:", statement)
+
+    def quote_literal(match):
+        name = match.group(1)
+        if name not in args:
+            return match.group(0)
+        value = validate_identifier(name, args[name])
+        return "'" + value + "'"
+
+    def quote_identifier(match):
+        name = match.group(1)
+        if name not in args:
+            return match.group(0)
+        value = validate_identifier(name, args[name])
+        return dialect.identifier_preparer.quote(quoted_name(value, None))
+
+    statement = re.sub(r"'\{(\w+)\}'", quote_literal, statement)
+    statement = re.sub(r"\{(\w+)\}", quote_identifier, statement)
+
+    return statement
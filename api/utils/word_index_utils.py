@@ -0,0 +1,170 @@
+import mmap
+import os
+import struct
+import tempfile
+import threading
+
+from sqlalchemy import select
+
+from api.config import Settings
+
+# magic, version, word count
+header_format = "<4sII"
+header_size = struct.calcsize(header_format)
+index_magic = b"WIDX"
+index_version = 1
+
+
+def get_index_path(directory: str, language_id: str):
+    return os.path.join(directory, f"{language_id}.idx")
+
+
+def get_file_version(stat):
+    # a rewritten index is a new file, so the inode changes even within one mtime tick
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def write_word_index(path: str, ids: list, words: list):
+    """
+    Writes a rank-ordered word index: the header, word ids (int64), offsets into the string table (uint64, one more than the words) and the UTF-8 string table. The file is written next to `path` and renamed over it, so readers never see a partial index.
+    """
+
+    import numpy as np
+
+    encoded = [word.encode("utf-8") for word in words]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u8")
+    np.cumsum([len(word) for word in encoded], out=offsets[1:])
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(struct.pack(header_format, index_magic, index_version, len(ids)))
+            file.write(np.asarray(ids, dtype="<i8").tobytes())
+            file.write(offsets.tobytes())
+            file.write(b"".join(encoded))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class WordIndex:
+    """
+    Read-only view of an index file. The file is memory-mapped, so every worker reading it shares the same page-cached copy and "top N words" is a slice of the id array.
+    """
+
+    def __init__(self, path: str) -> None:
+        import numpy as np
+
+        self.path = path
+
+        with open(path, "rb") as file:
+            self.version = get_file_version(os.fstat(file.fileno()))
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count = struct.unpack_from(header_format, self.buffer)
+        if magic != index_magic or version != index_version:
+            raise ValueError(f"Invalid word index: {path}")
+
+        ids_start = header_size
+        offsets_start = ids_start + count * 8
+        self.strings_start = offsets_start + (count + 1) * 8
+
+        self.ids = np.frombuffer(self.buffer, dtype="<i8", count=count, offset=ids_start)
+        self.offsets = np.frombuffer(
+            self.buffer, dtype="<u8", count=count + 1, offset=offsets_start
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def get_ids(self, start: int = 0, stop: int = None):
+        """Word ids ranked start + 1 to stop, most frequent first."""
+
+        return self.ids[start:stop]
+
+    def get_word(self, position: int) -> str:
+        start = self.strings_start + int(self.offsets[position])
+        stop = self.strings_start + int(self.offsets[position + 1])
+        return self.buffer[start:stop].decode("utf-8")
+
+    def get_words(self, start: int = 0, stop: int = None) -> list:
+        """(id, word) pairs ranked start + 1 to stop."""
+
+        start, stop, _ = slice(start, stop).indices(len(self))
+        return [
+            (int(self.ids[position]), self.get_word(position))
+            for position in range(start, stop)
+        ]
+
+
+class WordIndexStore:
+    """
+    Opens the index of a language on first use and reopens it when the file on disk has been replaced.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.indexes = {}
+        self.lock = threading.Lock()
+
+    def get(self, language_id: str) -> WordIndex:
+        """The current index of a language, or None if it hasn't been built."""
+
+        path = get_index_path(self.directory, language_id)
+
+        try:
+            version = get_file_version(os.stat(path))
+        except FileNotFoundError:
+            self.indexes.pop(language_id, None)
+            return None
+
+        index = self.indexes.get(language_id)
+        if index is not None and index.version == version:
+            return index
+
+        with self.lock:
+            index = self.indexes.get(language_id)
+            if index is None or index.version != version:
+                # replaced indexes are left to the garbage collector, requests may still hold them
+                index = self.indexes[language_id] = WordIndex(path)
+
+        return index
+
+    def build(self, engine, language_id: str, batch_size: int = 10000) -> WordIndex:
+        """Writes the index of a language from the words table, ordered by rank (unranked words last, by id)."""
+
+        from models.word import Word
+
+        statement = (
+            select(Word.id, Word.word)
+            .filter(Word.language_id == language_id)
+            .order_by(Word.rank.is_(None), Word.rank, Word.id)
+        )
+
+        ids = []
+        words = []
+
+        with engine.connect() as conn:
+            result = conn.execution_options(yield_per=batch_size).execute(statement)
+            for word_id, word in result:
+                ids.append(word_id)
+                words.append(word)
+
+        write_word_index(get_index_path(self.directory, language_id), ids, words)
+        return self.get(language_id)
+
+    def stats(self):
+        return {
+            language_id: {"words": len(index), "mtime_ns": index.version[1]}
+            for language_id, index in self.indexes.items()
+        }
+
+
+settings = Settings()
+word_index_store = WordIndexStore(settings.word_index_directory)
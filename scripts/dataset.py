@@ -0,0 +1,53 @@
+import os
+import sys
+
+root_directory = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+api_directory = os.path.join(root_directory, "api")
+sys.path[:0] = [root_directory, api_directory]
+
+from api import DatabaseContext
+from api.utils.parser import Parser, Argument
+
+
+if __name__ == "__main__":
+    dataset_arguments = [
+        Argument(
+            name=("-p", "--profile"),
+            default="small",
+            choices=["small", "medium", "large"],
+        ),
+        Argument(
+            name=("-d", "--db_context"),
+            default=DatabaseContext.LOCAL.value,
+            choices=[DatabaseContext.LOCAL.value, DatabaseContext.SERVER.value],
+        ),
+        Argument(name=("-s", "--seed"), type=int, default=None),
+        Argument(name=("-c", "--chunk_size"), type=int, default=50000),
+    ]
+
+    parser = Parser(parser_arguments=dataset_arguments)
+    args = parser.get_command_args()
+
+    from api.database import Base, get_db_object
+    from utils.dataset_utils import generate_dataset
+    import models
+
+    db = get_db_object(DatabaseContext(args.get("db_context")))
+    engine = db.get_bind()
+    db.close()
+
+    Base.metadata.create_all(engine)
+
+    results = generate_dataset(
+        engine,
+        Base.metadata,
+        profile=args.get("profile"),
+        seed=args.get("seed"),
+        chunk_size=args.get("chunk_size"),
+    )
+
+    for table_name, result in results.items():
+        print(
+            f"{table_name}: {result.rows} rows in {result.seconds:.2f}s "
+            f"({result.rows_per_second:.0f} rows/s), {len(result.errors)} errors"
+        )
@@ -1,44 +1,49 @@
+import functools
 import os
-import sqlite3
-from typing import List
+import sys
+from typing import TYPE_CHECKING
 
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+root_directory = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+api_directory = os.path.join(root_directory, "api")
+sys.path[:0] = [root_directory, api_directory]
 
 from api import DatabaseContext
 from api.utils.parser import Parser, Argument, PathArgument
-from api.utils.model_utils import (
-    generate_dummy_data,
-    get_model_table,
-    get_model_sequence_id,
-    get_schema_to_model_mapping,
-)
-
-from api.database import (
-    get_db_object,
-    get_db,
-    run_postgres_script,
-    get_script_path,
-)
-from api.schemas import (
-    DefaultUser,
-    UserCreate,
-    UserOut,
-    TokenCreate,
-    TokenData,
-)
-
-schemas = [
-    DefaultUser,
-    UserCreate,
-    UserOut,
-    TokenCreate,
-    TokenData,
-]
-
-models = [User, Role]
-
-schema_to_model_mapping = get_schema_to_model_mapping(schemas, models)
+
+
+@functools.cache
+def load_models():
+    """
+    Imports the models, schemas and database on first use, so `--help` only pays for the parser.
+    Returns the schemas, the models and the schema to model mapping.
+    """
+
+    from api.utils.model_utils import get_schema_to_model_mapping
+    # models are always imported as `models.*`, a second import path would
+    # define their tables twice
+    from models.user import User, Role
+    from api.schemas import (
+        UserBase,
+        UserCreate,
+        UserOut,
+        TokenCreate,
+        TokenData,
+    )
+
+    schemas = [
+        UserBase,
+        UserCreate,
+        UserOut,
+        TokenCreate,
+        TokenData,
+    ]
+
+    models = [User, Role]
+
+    return schemas, models, get_schema_to_model_mapping(schemas, models)
 
 
 class Dummy:
@@ -63,9 +68,18 @@ class Dummy:
         table_name: str = None,
         db_context=DatabaseContext.LOCAL,
         schema_to_model_mapping: dict = None,
+        chunk_size: int = 50000,
+        workers: int = 1,
+        seed: int = None,
         *args,
         **kwargs,
     ):
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.seed = seed
+        self.errors = {}
+        # LoadResult of the last bulk load per database, which keeps no instances
+        self.results = {}
         self.schema_to_model_mapping = schema_to_model_mapping
         self.model = model
         self.sequence_id = sequence_id
@@ -88,6 +102,8 @@ class Dummy:
     @table_name.setter
     def table_name(self, table_name):
         if table_name is None and self.model and self.schema_to_model_mapping:
+            from api.utils.model_utils import get_model_table
+
             table_name = get_model_table(self.model, self.schema_to_model_mapping)
         self._table_name = table_name
 
@@ -108,6 +124,8 @@ class Dummy:
     @sequence_id.setter
     def sequence_id(self, sequence_id):
         if self.model and self.schema_to_model_mapping:
+            from api.utils.model_utils import get_model_sequence_id
+
             self._sequence_id = get_model_sequence_id(
                 self.model, self.schema_to_model_mapping, sequence_id
             )
@@ -143,7 +161,8 @@ class Dummy:
         return self._conn
 
     @conn.setter
-    def conn(self, conn: sqlite3.Connection):
+    def conn(self, conn: "Session"):
+        """Session bound to the local SQLite database."""
         self._conn = conn
 
     @property
@@ -151,7 +170,9 @@ class Dummy:
         return self._session
 
     @session.setter
-    def session(self, session: Session):
+    def session(self, session: "Session"):
+        from sqlalchemy.orm import Session
+
         assert isinstance(session, Session)
         self._session = session
 
@@ -184,6 +205,8 @@ class Dummy:
         if model is None:
             return model
 
+        schemas, models, _ = load_models()
+
         for schema in schemas:
             schema_name = None
 
@@ -211,39 +234,85 @@ class Dummy:
 
         return self.items
 
+    def save_items(self, session: "Session", items: list, merge: bool = False):
+        """
+        Saves items in one transaction. If it fails, items are retried one by one and the failures are returned as (index, error) instead of aborting.
+        """
+
+        try:
+            saved = [session.merge(d) for d in items] if merge else items
+            session.add_all(saved)
+            session.commit()
+            return saved, []
+        except Exception:
+            session.rollback()
+
+        saved = []
+        errors = []
+
+        for index, d in enumerate(items):
+            try:
+                d = session.merge(d) if merge else d
+                session.add(d)
+                session.commit()
+                saved.append(d)
+            except Exception as e:
+                session.rollback()
+                errors.append((index, str(getattr(e, "orig", e))))
+
+        return saved, errors
+
+    def load_model_items(self, session: "Session"):
+        """Seeds `length` generated rows of the model with the bulk loader."""
+
+        from api.utils.load_utils import load_dummy_data
+
+        result = load_dummy_data(
+            session.get_bind(),
+            self.model,
+            self.length,
+            chunk_size=self.chunk_size,
+            workers=self.workers,
+            seed=self.seed,
+        )
+
+        print(
+            f"Inserted {result.rows} {self.model.__name__} rows in {result.seconds:.2f}s "
+            f"({result.rows_per_second:.0f} rows/s), {len(result.errors)} errors"
+        )
+        return result
+
     def insert_model_items(self, items: list = None):
-        items = generate_dummy_data(self.model, self.length) if items is None else items
+        """
+        Saves `items`, or bulk loads `length` generated rows without them. Returns the saved instances per database, or the LoadResult per database for a bulk load.
+        """
 
-        print("Inserting items...", items)
+        if items is not None and not isinstance(items, list):
+            items = [items]
 
         if self.current_session:
-            if isinstance(items, List):
-                for d in items:
-                    try:
-                        self.current_session.add(d)
-                        self.current_session.commit()
-                    except Exception as e:
-                        print(e)
-
+            if items is None:
+                result = self.load_model_items(self.current_session)
+                self.errors["server"] = result.errors
+                self.results["server"] = result
             else:
-                try:
-                    self.current_session.add(items)
-                    self.current_session.commit()
-                except Exception as e:
-                    print(e)
-
-            self.update_items(server_items=items)
+                saved, self.errors["server"] = self.save_items(
+                    self.current_session, items
+                )
+                self.update_items(server_items=saved)
 
         if self.current_conn:
-            if not isinstance(items, list):
-                items = [items]
-
-            # insert_items(
-            #     self.current_conn, self.local_table_name, items, self.column_names
-            # )
-            self.update_items(local_items=items)
+            if items is None:
+                result = self.load_model_items(self.current_conn)
+                self.errors["local"] = result.errors
+                self.results["local"] = result
+            else:
+                saved, self.errors["local"] = self.save_items(
+                    self.current_conn, items, merge=True
+                )
+                self.update_items(local_items=saved)
 
-        return self.items
+        return self.results if items is None else self.items
 
     def list_model_items(self):
 
@@ -251,29 +320,25 @@ class Dummy:
             server_items = self.current_session.query(self.model).all()
             self.update_items(server_items=server_items)
 
-        # if self.current_conn:
-        #     local_items = select_items(
-        #         self.current_conn,
-        #         self.local_table_name,
-        #         mapped_object_type=self.model,
-        #         column_names=self.column_names,
-        #     )
-        #     self.update_items(local_items=local_items)
+        if self.current_conn:
+            local_items = self.current_conn.query(self.model).all()
+            self.update_items(local_items=local_items)
 
         return self.items
 
     def delete_model_items(self):
 
         if self.current_session:
+            from api.database import get_script_path, run_postgres_script
+
             script_path = get_script_path("reset_table.sql")
 
             args = {"table_name": self.table_name, "sequence_id": self.sequence_id}
             run_postgres_script(script_path, args)
 
-        # if self.current_conn:
-        #     delete_items(
-        #         self.current_conn, self.local_table_name, filter_condition=None
-        #     )
+        if self.current_conn:
+            self.current_conn.query(self.model).delete()
+            self.current_conn.commit()
 
 
 if __name__ == "__main__":
@@ -288,11 +353,18 @@ if __name__ == "__main__":
         Argument(name=("-l", "--length"), type=int, default=1),
         Argument(name=("-i", "--sequence_id"), type=str, default=None),
         Argument(name=("-t", "--table_name"), type=str, default=None),
+        Argument(name=("-c", "--chunk_size"), type=int, default=50000),
+        Argument(name=("-w", "--workers"), type=int, default=1),
+        Argument(name=("-s", "--seed"), type=int, default=None),
     ]
 
     parser = Parser(parser_arguments=dummy_arguments)
     args = parser.get_command_args()
 
+    from api.database import get_db_object
+
+    schemas, models, schema_to_model_mapping = load_models()
+
     dummy = Dummy(
         **args,
         models=models,
@@ -307,6 +379,6 @@ if __name__ == "__main__":
     }
     action = args.get("action")
 
-    dummy.conn = conn
-    dummy.session = get_db_object()
+    dummy.conn = get_db_object(DatabaseContext.LOCAL)
+    dummy.session = get_db_object(DatabaseContext.SERVER)
     print(actions.get(action)())
@@ -0,0 +1,129 @@
+import os
+import subprocess
+import sys
+import time
+
+root_directory = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+api_directory = os.path.join(root_directory, "api")
+sys.path[:0] = [root_directory, api_directory]
+
+from api.utils.parser import Parser, Argument, BoolArgument
+
+scripts_directory = os.path.join(root_directory, "scripts")
+
+
+def get_environment():
+    """Environment with the same import paths the app and scripts run with."""
+
+    env = dict(os.environ)
+    paths = [root_directory, api_directory]
+    if env.get("PYTHONPATH"):
+        paths.append(env["PYTHONPATH"])
+    env["PYTHONPATH"] = os.pathsep.join(paths)
+    return env
+
+
+def get_import_times(module: str = "api.main"):
+    """
+    Imports a module in a fresh interpreter with `-X importtime`.
+    Returns (module, self microseconds, cumulative microseconds) tuples in import order.
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=get_environment(),
+        cwd=root_directory,
+    )
+
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to import {module}:\n{result.stderr}")
+
+    import_times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        import_times.append((name.strip(), int(self_us), int(cumulative_us)))
+
+    return import_times
+
+
+def time_command(command: list, repeat: int = 3):
+    """Best wall time of a command in seconds, out of `repeat` runs."""
+
+    best = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            command,
+            check=True,
+            capture_output=True,
+            env=get_environment(),
+            cwd=root_directory,
+        )
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+
+    return best
+
+
+def time_import(module: str, repeat: int = 3):
+    """Import time of a module, net of interpreter startup."""
+
+    startup = time_command([sys.executable, "-c", "pass"], repeat)
+    seconds = time_command([sys.executable, "-c", f"import {module}"], repeat)
+    return max(seconds - startup, 0.0)
+
+
+def time_script_help(script: str, repeat: int = 3):
+    script_path = os.path.join(scripts_directory, script)
+    return time_command([sys.executable, script_path, "--help"], repeat)
+
+
+def print_import_times(import_times: list, top: int = 20):
+    by_cumulative = sorted(import_times, key=lambda row: row[2], reverse=True)
+
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cumulative_us in by_cumulative[:top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+
+if __name__ == "__main__":
+    parser_arguments = [
+        Argument(name=("-m", "--module"), default="api.main"),
+        Argument(name=("-n", "--top"), type=int, default=20),
+        Argument(name=("-r", "--repeat"), type=int, default=3),
+        BoolArgument(name="--check", default=False),
+        Argument(name="--main_budget", type=float, default=2.0),
+        Argument(name="--help_budget", type=float, default=1.0),
+    ]
+
+    parser = Parser(parser_arguments)
+    args = parser.get_command_args()
+
+    print_import_times(get_import_times(args.get("module")), args.get("top"))
+
+    if args.get("check"):
+        repeat = args.get("repeat")
+
+        budgets = [
+            ("import api.main", time_import("api.main", repeat), args.get("main_budget")),
+            (
+                "scripts/dummy.py --help",
+                time_script_help("dummy.py", repeat),
+                args.get("help_budget"),
+            ),
+        ]
+
+        failed = False
+        print()
+        for name, seconds, budget in budgets:
+            status = "ok" if seconds <= budget else "over budget"
+            print(f"{name}: {seconds:.3f}s (budget {budget:.3f}s) {status}")
+            failed = failed or seconds > budget
+
+        sys.exit(1 if failed else 0)
@@ -0,0 +1,42 @@
+import os
+import sys
+
+root_directory = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+api_directory = os.path.join(root_directory, "api")
+sys.path[:0] = [root_directory, api_directory]
+
+from api import DatabaseContext
+from api.utils.parser import Parser, Argument, BoolArgument
+
+
+if __name__ == "__main__":
+    migrate_arguments = [
+        Argument(
+            name=("-d", "--db_context"),
+            default=DatabaseContext.SERVER.value,
+            choices=[DatabaseContext.LOCAL.value, DatabaseContext.SERVER.value],
+        ),
+        BoolArgument(name="--dry_run", default=False),
+    ]
+
+    parser = Parser(parser_arguments=migrate_arguments)
+    args = parser.get_command_args()
+
+    from api.database import Base, get_engine
+    from utils.schema_utils import (
+        ensure_schema,
+        format_schema_changes,
+        get_schema_changes,
+    )
+
+    engine = get_engine(DatabaseContext(args.get("db_context")))
+    changes = get_schema_changes(engine, Base.metadata)
+
+    if not changes:
+        print("No missing columns or indexes")
+    else:
+        print(f"Missing: {format_schema_changes(changes)}")
+
+    if not args.get("dry_run"):
+        ensure_schema(engine, Base.metadata, migrate=True)
+        print("Schema up to date")
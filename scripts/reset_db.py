@@ -1,15 +1,16 @@
 import os
-import subprocess
 import sys
-import time
+
+root_directory = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+api_directory = os.path.join(root_directory, "api")
+sys.path[:0] = [root_directory, api_directory]
 
 from api import DatabaseContext
 from api.utils.hash_utils import hash_password
 
-root_directory = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
-sys.path.insert(0, root_directory)
-
 from api.database import (
+    Base,
+    engine,
     get_db_object,
     run_postgres_script,
     create_db_script,
@@ -17,7 +18,7 @@ from api.database import (
     database_name,
 )
 
-from api.models.user import User, Role
+from models.user import User, Role
 from dummy import Dummy
 
 from constants import *
@@ -43,18 +44,12 @@ if __name__ == "__main__":
     run_postgres_script(drop_db_script, args)
     run_postgres_script(create_db_script, args)
 
-    # RUN HERE
-    uvicorn_process = subprocess.Popen(
-        ["uvicorn", "api.main:app", "--reload", "--log-level", "debug"]
-    )
-    time.sleep(3)
-
-    uvicorn_process.terminate()
+    Base.metadata.create_all(engine)
 
     dummy = Dummy(model=Role, length=3, db_context=DatabaseContext.ALL)
 
-    dummy.conn = create_connection(ss_db_path)
-    dummy.session = get_db_object()
+    dummy.conn = get_db_object(DatabaseContext.LOCAL)
+    dummy.session = get_db_object(DatabaseContext.SERVER)
 
     # insert sample users
 
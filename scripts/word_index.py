@@ -0,0 +1,49 @@
+import os
+import sys
+
+root_directory = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+api_directory = os.path.join(root_directory, "api")
+sys.path[:0] = [root_directory, api_directory]
+
+from api import DatabaseContext
+from api.utils.parser import Parser, Argument
+
+
+if __name__ == "__main__":
+    word_index_arguments = [
+        Argument(name=("-l", "--language_id"), default=None),
+        Argument(
+            name=("-d", "--db_context"),
+            default=DatabaseContext.LOCAL.value,
+            choices=[DatabaseContext.LOCAL.value, DatabaseContext.SERVER.value],
+        ),
+    ]
+
+    parser = Parser(parser_arguments=word_index_arguments)
+    args = parser.get_command_args()
+
+    import time
+
+    from sqlalchemy import select
+
+    from api.database import get_db_object
+    from utils.word_index_utils import word_index_store
+    from models.language import Language
+    from models.word import Word
+
+    db = get_db_object(DatabaseContext(args.get("db_context")))
+    engine = db.get_bind()
+
+    if args.get("language_id"):
+        language_ids = [args.get("language_id")]
+    else:
+        language_ids = db.execute(select(Language.id).order_by(Language.id)).scalars().all()
+    db.close()
+
+    for language_id in language_ids:
+        start = time.perf_counter()
+        index = word_index_store.build(engine, language_id)
+        print(
+            f"{language_id}: {len(index)} words in {time.perf_counter() - start:.2f}s "
+            f"-> {index.path}"
+        )
@@ -0,0 +1,60 @@
+import os
+import sys
+import tempfile
+
+root_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+api_directory = os.path.join(root_directory, "api")
+sys.path[:0] = [root_directory, api_directory]
+
+# settings are read on import, so the test database is chosen before the app loads
+database_directory = tempfile.mkdtemp()
+os.environ["DATABASE_CONTEXT"] = "local"
+os.environ["LOCAL_DATABASE_PATH"] = os.path.join(database_directory, "test.db")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+
+@pytest.fixture(scope="session")
+def client():
+    from api.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+def create_user(client, username: str, roles: list = ()) -> dict:
+    """Registers a user with the given roles and returns the headers of a fresh token."""
+
+    from api.database import local_engine
+    from models.user import Role, User
+
+    password = f"{username}-password"
+    response = client.post(
+        "/register",
+        json={
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": password,
+        },
+    )
+    assert response.status_code == 200, response.text
+
+    with Session(local_engine) as db:
+        user = db.execute(select(User).filter(User.username == username)).scalar_one()
+        for name in roles:
+            role = db.execute(select(Role).filter(Role.name == name)).scalar()
+            user.roles.append(role or Role(name=name))
+        db.commit()
+
+    response = client.post("/login", data={"username": username, "password": password})
+    assert response.status_code == 200, response.text
+
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    return create_user(client, "admin", ["admin"])
@@ -0,0 +1,45 @@
+import os
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, select
+
+from utils.load_utils import copy_null, copy_rows, format_copy_value
+
+# COPY needs PostgreSQL, e.g. TEST_POSTGRES_URL=postgresql://postgres@localhost/test
+postgres_url = os.environ.get("TEST_POSTGRES_URL")
+
+
+def test_copy_values_keep_null_and_empty_string_apart():
+    assert format_copy_value(None) == copy_null
+    assert format_copy_value("") == '""'
+    assert format_copy_value("\\N") == '"\\N"'
+    assert format_copy_value('a"b,c') == '"a""b,c"'
+
+
+@pytest.mark.skipif(postgres_url is None, reason="TEST_POSTGRES_URL is not set")
+def test_copy_round_trips_strings():
+    engine = create_engine(postgres_url)
+    metadata = MetaData()
+    table = Table(
+        "load_utils_copy_test",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("value", String, nullable=True),
+    )
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+    values = [None, "", 'a"b,c', "\\N", "two\nlines"]
+    rows = list(enumerate(values, 1))
+
+    try:
+        # copy_rows directly, load_columns would hide a failed COPY behind its INSERT retry
+        with engine.begin() as conn:
+            copy_rows(conn, table, ["id", "value"], rows)
+
+        with engine.connect() as conn:
+            stored = conn.execute(select(table.c.value).order_by(table.c.id)).scalars()
+            assert list(stored) == values
+    finally:
+        metadata.drop_all(engine)
+        engine.dispose()
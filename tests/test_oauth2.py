@@ -0,0 +1,53 @@
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from conftest import create_user
+
+
+def delete_user_row(username: str):
+    from api.database import local_engine
+    from models.user import User, user_roles
+
+    with Session(local_engine) as db:
+        user = db.query(User).filter(User.username == username).one()
+        db.execute(delete(user_roles).where(user_roles.c.user_id == user.id))
+        db.delete(user)
+        db.commit()
+
+
+def test_tokens_of_deleted_users_are_rejected(client):
+    from utils.oauth2 import principal_cache, role_version_cache
+
+    headers = create_user(client, "deleted-admin", ["admin"])
+    assert client.get("/users/", headers=headers).status_code == 200
+    assert client.get("/games/reviews/due", headers=headers).status_code == 200
+
+    delete_user_row("deleted-admin")
+    principal_cache.clear()
+    role_version_cache.clear()
+
+    assert client.get("/users/", headers=headers).status_code == 401
+    assert client.get("/internal/pool", headers=headers).status_code == 401
+    assert client.get("/games/reviews/due", headers=headers).status_code == 401
+
+
+def test_deleting_a_user_rejects_their_cached_token(client, admin_headers):
+    headers = create_user(client, "deleted-user")
+    assert client.get("/games/reviews/due", headers=headers).status_code == 200
+
+    users = client.get("/users/", params={"limit": 500}, headers=admin_headers).json()
+    user_id = next(u["id"] for u in users["items"] if u["username"] == "deleted-user")
+
+    response = client.delete(f"/users/{user_id}", headers=admin_headers)
+    assert response.status_code == 204, response.text
+
+    assert client.get("/games/reviews/due", headers=headers).status_code == 401
+
+
+def test_logged_out_tokens_are_rejected(client):
+    headers = create_user(client, "logged-out-user")
+    assert client.get("/games/reviews/due", headers=headers).status_code == 200
+
+    assert client.post("/logout", headers=headers).status_code == 200
+
+    assert client.get("/games/reviews/due", headers=headers).status_code == 401
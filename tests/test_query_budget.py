@@ -0,0 +1,34 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from utils.query_utils import assert_max_queries
+
+
+def test_get_users_query_count_does_not_grow_with_users(client, admin_headers):
+    for i in range(20):
+        response = client.post(
+            "/register",
+            json={
+                "username": f"user{i}",
+                "email": f"user{i}@example.com",
+                "password": "password",
+            },
+        )
+        assert response.status_code == 200, response.text
+
+    with assert_max_queries(2, max_repeats=1):
+        response = client.get("/users/", headers=admin_headers)
+
+    assert response.status_code == 200, response.text
+    assert len(response.json()["items"]) >= 21
+
+
+def test_failed_statements_leave_no_start_time(client):
+    from api.database import local_engine
+
+    with local_engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM missing_table"))
+
+        assert not conn.info.get("query_start_time")
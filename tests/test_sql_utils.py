@@ -0,0 +1,34 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from utils.sql_utils import substitute_placeholders
+
+dialect = postgresql.dialect()
+
+
+def test_placeholders_are_rendered_not_bound():
+    statement = substitute_placeholders(
+        "DO $$ BEGIN PERFORM pg_get_serial_sequence('{table_name}', '{sequence_id}'); END $$",
+        {"table_name": "users", "sequence_id": "id"},
+        dialect,
+    )
+
+    assert statement == "DO $$ BEGIN PERFORM pg_get_serial_sequence('users', 'id'); END $$"
+
+    # reserved words are quoted as identifiers
+    statement = substitute_placeholders(
+        "DELETE FROM {table_name}", {"table_name": "user"}, dialect
+    )
+    assert statement == 'DELETE FROM "user"'
+
+
+def test_invalid_identifiers_are_rejected():
+    with pytest.raises(ValueError):
+        substitute_placeholders(
+            "DELETE FROM {table_name}",
+            {"table_name": "users; DROP TABLE users"},
+            dialect,
+        )
+
+    with pytest.raises(ValueError):
+        substitute_placeholders("SELECT '{name}'", {"name": "x' OR '1'='1"}, dialect)